@@ -0,0 +1,177 @@
+'''
+@file AsyncSerial.py
+@brief Módulo com o transporte serial assíncrono (asyncio) para quadros XBee.
+
+Este módulo fornece uma classe AsyncSerialTransport que registra o descritor
+da porta serial no laço de eventos do asyncio (loop.add_reader/add_writer) e
+oferece as operações assíncronas read_frame e write_frame, compartilhadas pelo
+receptor (RealXBeeData) e pelo transmissor (envia.py). Assim um único processo,
+em uma única thread, pode atender várias portas e fluxos de envio.
+
+Os descritores das portas seriais só podem ser registrados no laço de eventos
+em sistemas POSIX (Linux, macOS).
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import asyncio
+import os
+import time
+import serial
+from FrameParser import FrameParser
+
+'''Definição de Constantes'''
+MAX_READ_SIZE = 4096
+MAX_PENDING_FRAMES = 4096
+
+class AsyncSerialTransport:
+    """Classe para leitura e escrita de quadros na porta serial com asyncio."""
+
+    def __init__(self, port, baudrate, max_pending_frames=MAX_PENDING_FRAMES):
+        """Inicializa uma nova instância de AsyncSerialTransport.
+
+        Args:
+            port (str): A porta serial.
+            baudrate (int): A taxa de baud.
+            max_pending_frames (int): Quantidade máxima de quadros recebidos
+                aguardando read_frame; os excedentes são descartados e contados.
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.serial_port = None
+        self.loop = None
+        self.fd = None
+        self.parser = FrameParser()
+        self.frames = asyncio.Queue(max_pending_frames)
+        self.write_buffer = bytearray()
+        self.write_waiters = []
+        self.overflow_count = 0
+        self.read_time_ns = 0
+        self.read_monotonic_ns = 0
+        self.closed = False
+
+    async def __aenter__(self):
+        """Abre a porta ao entrar em um bloco async with."""
+        self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Fecha a porta ao sair de um bloco async with."""
+        self.close()
+
+    def open(self):
+        """Abre a porta serial e registra o seu descritor no laço de eventos em execução."""
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        self.serial_port = serial.Serial(self.port, self.baudrate, timeout=0, write_timeout=0, exclusive=True)
+        self.fd = self.serial_port.fileno()
+        os.set_blocking(self.fd, False)
+        self.loop.add_reader(self.fd, self._on_readable)
+
+    def close(self):
+        """Remove a porta do laço de eventos e a fecha.
+
+        Quem aguarda em read_frame ou write_frame recebe ConnectionError.
+        """
+        if not self.closed:
+            self.closed = True
+            # Sentinela que acorda quem aguarda em read_frame; abre espaço se a fila estiver cheia
+            if self.frames.full():
+                self.frames.get_nowait()
+                self.overflow_count += 1
+            self.frames.put_nowait(None)
+        if self.fd is not None:
+            self.loop.remove_reader(self.fd)
+            self.loop.remove_writer(self.fd)
+            self.fd = None
+        for waiter in self.write_waiters:
+            if not waiter.done():
+                waiter.set_exception(ConnectionError(f"{self.port} closed"))
+        self.write_waiters = []
+        if self.serial_port and self.serial_port.is_open:
+            self.serial_port.close()
+
+    def _on_readable(self):
+        """Lê todos os bytes disponíveis e enfileira os quadros completos."""
+        try:
+            chunk = os.read(self.fd, MAX_READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            print(f"Error reading {self.port}: {e}")
+            self.close()
+            return
+        if not chunk:
+            # Fim de arquivo: o dispositivo foi desconectado
+            self.close()
+            return
+        self.read_time_ns = time.time_ns()
+        self.read_monotonic_ns = time.monotonic_ns()
+        self.parser.scan(chunk, self._enqueue_frame)
+
+    def _enqueue_frame(self, frame):
+        """Enfileira um quadro completo com o instante da leitura."""
+        try:
+            self.frames.put_nowait((bytes(frame), self.read_time_ns, self.read_monotonic_ns))
+        except asyncio.QueueFull:
+            self.overflow_count += 1
+
+    async def read_frame(self):
+        """Aguarda o próximo quadro completo.
+
+        Returns:
+            tuple: (frame, timestamp_ns, monotonic_ns), com o quadro AB ... CD em bytes.
+
+        Raises:
+            ConnectionError: Se a porta foi fechada (ou o dispositivo desconectado)
+                e não há mais quadros pendentes.
+        """
+        item = await self.frames.get()
+        if item is None:
+            self.frames.put_nowait(None)  # Mantém a sentinela para as próximas chamadas
+            raise ConnectionError(f"{self.port} closed")
+        return item
+
+    async def write_frame(self, frame):
+        """Escreve um quadro na porta, aguardando apenas se o buffer do sistema estiver cheio.
+
+        Args:
+            frame (bytes): Os bytes a escrever.
+        """
+        if not self.write_buffer:
+            try:
+                written = os.write(self.fd, frame)
+            except BlockingIOError:
+                written = 0
+            if written == len(frame):
+                return
+            frame = frame[written:]
+            self.loop.add_writer(self.fd, self._on_writable)
+        self.write_buffer += frame
+        waiter = self.loop.create_future()
+        self.write_waiters.append(waiter)
+        await waiter
+
+    def _on_writable(self):
+        """Escreve o restante do buffer de saída quando a porta aceita mais dados."""
+        try:
+            written = os.write(self.fd, self.write_buffer)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            for waiter in self.write_waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            self.write_waiters = []
+            self.write_buffer.clear()
+            self.loop.remove_writer(self.fd)
+            return
+        del self.write_buffer[:written]
+        if not self.write_buffer:
+            self.loop.remove_writer(self.fd)
+            for waiter in self.write_waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+            self.write_waiters = []
@@ -0,0 +1,216 @@
+'''
+@file Benchmark.py
+@brief Módulo com o benchmark de vazão e latência do caminho de recepção.
+
+Este módulo aciona o caminho de recepção de RealXBeeData (leitura da porta,
+FrameParser, FrameRing e o consumo em lotes feito pela interface) através de
+um par de pseudo-terminais, em cada taxa de baud e tamanho de quadro pedidos.
+Um processo separado escreve os quadros no ritmo da taxa de baud (10 bits por
+byte), com um número de sequência no payload, e registra o instante de cada
+escrita; o processo medido consome os quadros como o XBeeDataViewer faz, a
+cada intervalo de atualização. O resultado é emitido em JSON, para comparar
+versões:
+
+    quadros/s, bytes/s, latência p50/p99/p999 (da escrita ao consumo),
+    CPU por quadro e quadros perdidos.
+
+Apenas em sistemas POSIX (Linux, macOS). A renderização do Tk não é medida.
+
+Uso: python Benchmark.py [--baudrates 9600 115200] [--frame-sizes 7 16] [--duration 5] [--output arquivo.json]
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import threading
+import time
+from FrameParser import MAX_FRAME_SIZE
+from RealXBeeData import RealXBeeData
+from XBeeEmulator import open_pty
+
+'''Definição de Constantes'''
+DEFAULT_BAUDRATES = (9600, 115200, 460800, 921600)
+DEFAULT_FRAME_SIZES = (7,)
+DEFAULT_DURATION = 5.0
+MIN_FRAME_SIZE = 7  # AB 81 10 + 3 bytes de sequência + CD
+SEQUENCE_LIMIT = 1 << 21  # Sequência em 3 bytes de 7 bits, que nunca valem AB nem CD
+# Mesmos valores do XBeeDataViewer, sem importar o tkinter
+REFRESH_INTERVAL_MS = 33
+MAX_FRAMES_PER_REFRESH = 2000
+SETTLE_TIME = 0.5  # Tempo sem quadros novos, após o fim da escrita, para encerrar a medição
+
+def build_frame(sequence, frame_size):
+    """Monta um quadro de teste AB 81 10 <sequência> <preenchimento> CD."""
+    return (bytes((0xAB, 0x81, 0x10, (sequence >> 14) & 0x7F, (sequence >> 7) & 0x7F, sequence & 0x7F))
+            + bytes(frame_size - MIN_FRAME_SIZE) + b'\xCD')
+
+def frame_sequence(frame):
+    """Retorna o número de sequência de um quadro de teste."""
+    return (frame[3] << 14) | (frame[4] << 7) | frame[5]
+
+def percentile(sorted_values, fraction):
+    """Retorna o percentil (por posição) de uma lista já ordenada."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def write_frames(master, baudrate, frame_size, total, send_times):
+    """Escreve total quadros no lado mestre no ritmo da taxa de baud.
+
+    Executado em um processo separado, para que o seu consumo de CPU não entre
+    na medição. Como em uma UART, os bytes que não cabem no buffer do
+    pseudo-terminal são perdidos em vez de atrasar o transmissor.
+
+    Args:
+        master (int): Descritor do lado mestre do pseudo-terminal.
+        baudrate (int): A taxa de baud simulada.
+        frame_size (int): O tamanho de cada quadro, em bytes.
+        total (int): Quantidade de quadros escritos.
+        send_times: Array compartilhado com o instante (time.monotonic_ns) da escrita de cada quadro.
+    """
+    os.set_blocking(master, False)
+    frame_time_ns = frame_size * 10 * 1e9 / baudrate
+    start = time.monotonic_ns()
+    sequence = 0
+    while sequence < total:
+        due = min(total, int((time.monotonic_ns() - start) / frame_time_ns) + 1)
+        if due > sequence:
+            data = b''.join(build_frame(s, frame_size) for s in range(sequence, due))
+            now = time.monotonic_ns()
+            try:
+                os.write(master, data)
+            except BlockingIOError:
+                pass
+            for s in range(sequence, due):
+                send_times[s] = now
+            sequence = due
+        else:
+            time.sleep(max(0.0, (start + sequence * frame_time_ns - time.monotonic_ns()) / 1e9))
+
+def run_benchmark(baudrate, frame_size, duration=DEFAULT_DURATION, refresh_interval_ms=REFRESH_INTERVAL_MS,
+                  max_frames_per_refresh=MAX_FRAMES_PER_REFRESH):
+    """Mede o caminho de recepção em uma taxa de baud e tamanho de quadro.
+
+    Args:
+        baudrate (int): A taxa de baud simulada.
+        frame_size (int): O tamanho de cada quadro, em bytes (de 7 a MAX_FRAME_SIZE).
+        duration (float): Duração da escrita, em segundos.
+        refresh_interval_ms (int): Intervalo entre os consumos, como no XBeeDataViewer.
+        max_frames_per_refresh (int): Quantidade máxima de quadros por consumo.
+
+    Returns:
+        dict: Os resultados da medição.
+
+    Raises:
+        ValueError: Se o tamanho do quadro estiver fora dos limites.
+    """
+    if not MIN_FRAME_SIZE <= frame_size <= MAX_FRAME_SIZE:
+        raise ValueError(f"O tamanho do quadro deve estar entre {MIN_FRAME_SIZE} e {MAX_FRAME_SIZE}")
+    total = min(SEQUENCE_LIMIT, max(1, int(duration * baudrate / 10 / frame_size)))
+    master, slave, port = open_pty()
+    context = multiprocessing.get_context('fork')
+    send_times = context.RawArray('q', total)
+    xbee = RealXBeeData(None, port, baudrate, max_history=total + 1)
+    receive_thread = threading.Thread(target=xbee.receive_data)
+    receive_thread.start()
+    while not (xbee.serial_port and xbee.serial_port.is_open) and receive_thread.is_alive():
+        time.sleep(0.01)
+
+    batches = []  # (primeiro índice, índice final, instante do consumo)
+    writer = context.Process(target=write_frames, args=(master, baudrate, frame_size, total, send_times))
+    cpu_start = time.process_time()
+    wall_start = time.monotonic_ns()
+    writer.start()
+    last_frame_ns = time.monotonic_ns()
+    try:
+        while True:
+            time.sleep(refresh_interval_ms / 1000)
+            first = xbee.packets.total_count
+            xbee.drain_frames(max_frames_per_refresh)
+            now = time.monotonic_ns()
+            if xbee.packets.total_count > first:
+                batches.append((first, xbee.packets.total_count, now))
+                last_frame_ns = now
+            elif not writer.is_alive() and not len(xbee.frames) and now - last_frame_ns > SETTLE_TIME * 1e9:
+                break
+    finally:
+        cpu_time = time.process_time() - cpu_start
+        writer.join()
+        xbee.stop_real_communication()
+        receive_thread.join()
+        os.close(master)
+        os.close(slave)
+
+    latencies = []
+    received = set()
+    for first, end, drained_ns in batches:
+        for index in range(first, end):
+            frame = xbee.packets.frame(index)
+            if len(frame) != frame_size or frame[1] != 0x81:
+                continue
+            sequence = frame_sequence(frame)
+            if sequence < total and sequence not in received:
+                received.add(sequence)
+                latencies.append(drained_ns - send_times[sequence])
+    latencies.sort()
+    elapsed = ((batches[-1][2] if batches else time.monotonic_ns()) - wall_start) / 1e9
+    frames = len(received)
+
+    def latency_us(fraction):
+        value = percentile(latencies, fraction)
+        return value / 1e3 if value is not None else None
+
+    return {
+        'baudrate': baudrate,
+        'frame_size': frame_size,
+        'frames_sent': total,
+        'frames_received': frames,
+        'dropped_frames': total - frames,
+        'ring_overflows': xbee.frames.overflow_count,
+        'ring_high_water_mark': xbee.frames.high_water_mark,
+        'resyncs': xbee.parser.resync_count,
+        'frames_per_second': frames / elapsed if elapsed else 0.0,
+        'bytes_per_second': frames * frame_size / elapsed if elapsed else 0.0,
+        'latency_us': {
+            'p50': latency_us(0.5),
+            'p99': latency_us(0.99),
+            'p999': latency_us(0.999),
+            'max': latencies[-1] / 1e3 if latencies else None,
+        },
+        'cpu_us_per_frame': cpu_time * 1e6 / frames if frames else None,
+    }
+
+def run_suite(baudrates=DEFAULT_BAUDRATES, frame_sizes=DEFAULT_FRAME_SIZES, duration=DEFAULT_DURATION):
+    """Executa run_benchmark para cada combinação de taxa de baud e tamanho de quadro.
+
+    Returns:
+        dict: O ambiente da execução e a lista de resultados.
+    """
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'duration': duration,
+        'results': [run_benchmark(baudrate, frame_size, duration)
+                    for frame_size in frame_sizes for baudrate in baudrates],
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do caminho de recepção sobre pseudo-terminais")
+    parser.add_argument('--baudrates', type=int, nargs='+', default=list(DEFAULT_BAUDRATES))
+    parser.add_argument('--frame-sizes', type=int, nargs='+', default=list(DEFAULT_FRAME_SIZES))
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help="segundos de escrita por medição")
+    parser.add_argument('--output', help="arquivo JSON de saída; sem ele, o resultado vai para a saída padrão")
+    args = parser.parse_args()
+
+    report = json.dumps(run_suite(args.baudrates, args.frame_sizes, args.duration), indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(report + '\n')
+    else:
+        print(report)
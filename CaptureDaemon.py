@@ -0,0 +1,265 @@
+'''
+@file CaptureDaemon.py
+@brief Módulo para captura sem interface gráfica, como serviço.
+
+Este módulo fornece uma classe CaptureDaemon que executa o mesmo caminho de
+captura do XBeeDataViewer (RealXBeeData ou MultiPortCapture, log rotacionado,
+métricas) sem importar o tkinter, para gateways Linux sem monitor. Os lotes de
+quadros consumidos são entregues a saídas (sinks) intercambiáveis: qualquer
+objeto com os métodos write(batch), flush() e close(). Há saídas para texto no
+formato do log e para JSON Lines, na saída padrão ou em arquivo.
+
+Sinais (POSIX):
+    SIGTERM, SIGINT: descarrega as saídas e o log, grava o resumo e encerra.
+    SIGHUP: descarrega as saídas e inicia um novo segmento de log (para o logrotate).
+    SIGUSR1: grava o detalhamento das etapas, se a medição estiver ativa.
+
+Uso: python CaptureDaemon.py porta [porta ...] | auto [--baudrate 9600] [--log-dir dir] [--compression gzip|zstd|none]
+                             [--no-log] [--sink text[:arquivo]] [--sink jsonl[:arquivo]]
+                             [--metrics-port 9464] [--metrics-json arquivo.json] [--profile 100]
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import argparse
+import contextlib
+import json
+import os
+import signal
+import sys
+import time
+from CaptureLog import RotatingCaptureLog
+from RealXBeeData import RealXBeeData
+
+'''Definição de Constantes'''
+# Intervalo entre os consumos do buffer circular; maior que o da interface, pois não há tela a atualizar
+DRAIN_INTERVAL = 0.1
+MAX_FRAMES_PER_DRAIN = 20000
+
+class TextSink:
+    """Classe para saída dos quadros em texto, no mesmo formato das linhas do log."""
+
+    def __init__(self, filename=None):
+        """Inicializa uma nova instância de TextSink.
+
+        Args:
+            filename (str): O arquivo de saída, aberto para acrescentar; saída padrão se None.
+        """
+        self.file = open(filename, 'a', newline='\n') if filename else sys.stdout
+
+    def format(self, data):
+        """Retorna a linha de um quadro."""
+        return f"{data['timestamp']} - {data['source']}: {data['data']}\n"
+
+    def write(self, batch):
+        """Escreve um lote de dados com uma única chamada.
+
+        Args:
+            batch (list[dict]): Os dados com as chaves 'source', 'data' e 'timestamp'.
+        """
+        if batch:
+            self.file.write(''.join(self.format(data) for data in batch))
+
+    def flush(self):
+        """Descarrega o buffer da saída."""
+        self.file.flush()
+
+    def close(self):
+        """Descarrega e fecha a saída (a saída padrão permanece aberta)."""
+        self.flush()
+        if self.file is not sys.stdout:
+            self.file.close()
+
+class JsonLinesSink(TextSink):
+    """Classe para saída dos quadros em JSON Lines, um objeto por quadro."""
+
+    def format(self, data):
+        """Retorna a linha JSON de um quadro."""
+        return json.dumps(data) + '\n'
+
+# Saídas disponíveis na linha de comando, no formato tipo[:arquivo]
+SINK_TYPES = {'text': TextSink, 'jsonl': JsonLinesSink}
+
+def create_sink(spec):
+    """Cria uma saída a partir da sua especificação na linha de comando.
+
+    Args:
+        spec (str): 'tipo' ou 'tipo:arquivo', com o tipo em SINK_TYPES.
+
+    Returns:
+        A saída criada.
+
+    Raises:
+        ValueError: Se o tipo for desconhecido.
+    """
+    kind, _, filename = spec.partition(':')
+    if kind not in SINK_TYPES:
+        raise ValueError(f"Saída desconhecida: {kind} (disponíveis: {', '.join(SINK_TYPES)})")
+    return SINK_TYPES[kind](filename or None)
+
+class CaptureDaemon:
+    """Classe para execução da captura sem interface gráfica."""
+
+    def __init__(self, ports, baudrate=9600, sinks=(), capture_log=True, log_directory='.', compression='gzip',
+                 drain_interval=DRAIN_INTERVAL):
+        """Inicializa uma nova instância de CaptureDaemon.
+
+        Args:
+            ports (list[str]): As portas seriais; mais de uma usa MultiPortCapture.
+            baudrate (int): A taxa de baud dos dispositivos XBee.
+            sinks (list): As saídas que recebem cada lote de dados consumido.
+            capture_log (bool): Se a captura é gravada no log rotacionado.
+            log_directory (str): O diretório dos segmentos de log.
+            compression (str): 'gzip', 'zstd' ou None para o log em texto puro.
+            drain_interval (float): Intervalo, em segundos, entre os consumos do buffer circular.
+        """
+        if len(ports) > 1:
+            from MultiPortCapture import MultiPortCapture
+            self.xbee = MultiPortCapture(None, ports, baudrate)
+        else:
+            self.xbee = RealXBeeData(None, ports[0], baudrate)
+        self.sinks = list(sinks)
+        self.drain_interval = drain_interval
+        self.capture_log = capture_log
+        if capture_log:
+            self.xbee.capture_log = RotatingCaptureLog(log_directory, compression=compression)
+        self.running = False
+        self.rotate_requested = False
+        self.profile_requested = False
+
+    def install_signal_handlers(self):
+        """Associa SIGTERM, SIGINT, SIGHUP e SIGUSR1 às ações do serviço.
+
+        Os tratadores apenas registram o pedido; o encerramento, a rotação e a
+        gravação do perfil são feitos pelo laço principal entre dois lotes.
+        """
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, self.handle_rotate)
+            signal.signal(signal.SIGUSR1, self.handle_profile)
+
+    def handle_stop(self, signum, frame):
+        """Tratador de SIGTERM e SIGINT."""
+        self.running = False
+
+    def handle_rotate(self, signum, frame):
+        """Tratador de SIGHUP."""
+        self.rotate_requested = True
+
+    def handle_profile(self, signum, frame):
+        """Tratador de SIGUSR1."""
+        self.profile_requested = True
+
+    def drain(self):
+        """Consome os quadros pendentes, grava-os no log e os entrega às saídas.
+
+        Returns:
+            int: Quantidade de quadros consumidos.
+        """
+        batch = self.xbee.drain_frames(MAX_FRAMES_PER_DRAIN)
+        for sink in list(self.sinks):
+            try:
+                sink.write(batch)
+            except BrokenPipeError:
+                # O leitor da saída encerrou (por exemplo, head): a saída é descartada e a captura termina
+                self.sinks.remove(sink)
+                self.running = False
+                if sink.file is sys.stdout:
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return len(batch)
+
+    def flush(self):
+        """Descarrega as saídas e o log."""
+        for sink in self.sinks:
+            sink.flush()
+        if self.xbee.capture_log:
+            self.xbee.capture_log.flush()
+
+    def rotate(self):
+        """Descarrega as saídas e inicia um novo segmento de log."""
+        self.flush()
+        if self.xbee.capture_log:
+            self.xbee.capture_log.rotate()
+
+    def dump_profile(self):
+        """Grava o detalhamento das etapas em perfil_<instante>.json e .folded, se a medição estiver ativa."""
+        if self.xbee.profiler:
+            base = time.strftime('perfil_%Y%m%d-%H%M%S')
+            self.xbee.profiler.dump(f"{base}.json")
+            self.xbee.profiler.dump(f"{base}.folded")
+            print(f"Perfil gravado em {base}.json e {base}.folded", file=sys.stderr)
+
+    def run(self):
+        """Executa a captura até SIGTERM/SIGINT ou até a thread de leitura terminar.
+
+        Ao encerrar, consome os quadros restantes, fecha as saídas, grava o
+        resumo e fecha o log.
+        """
+        self.running = True
+        self.xbee.start_real_communication(self.capture_log)
+        try:
+            while self.running and self.xbee.receive_thread.is_alive():
+                time.sleep(self.drain_interval)
+                while self.drain() == MAX_FRAMES_PER_DRAIN:
+                    pass  # Atraso acumulado: consome sem esperar
+                if self.rotate_requested:
+                    self.rotate_requested = False
+                    self.rotate()
+                if self.profile_requested:
+                    self.profile_requested = False
+                    self.dump_profile()
+        finally:
+            self.xbee.stop_real_communication()
+            self.xbee.join_threads()
+            while self.drain():
+                pass
+            for sink in self.sinks:
+                sink.close()
+            if self.xbee.capture_log:
+                # Mensagens do serviço na saída de erros: a saída padrão pode ser uma das saídas de dados
+                with contextlib.redirect_stdout(sys.stderr):
+                    self.xbee.download_data()
+                self.xbee.close_log()
+            self.xbee.metrics.stop()
+            self.dump_profile()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Captura do XBee sem interface gráfica")
+    parser.add_argument('ports', nargs='+', help="portas seriais, ou auto para descobrir a porta e a taxa de baud")
+    parser.add_argument('--baudrate', type=int, default=9600)
+    parser.add_argument('--log-dir', default='.', help="diretório dos segmentos de log")
+    parser.add_argument('--compression', choices=('gzip', 'zstd', 'none'), default='gzip')
+    parser.add_argument('--no-log', action='store_true', help="não grava o log rotacionado")
+    parser.add_argument('--sink', action='append', default=[], metavar='TIPO[:ARQUIVO]',
+                        help=f"saída adicional ({', '.join(SINK_TYPES)}); na saída padrão se não houver arquivo")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="publica as métricas (formato do Prometheus) em http://127.0.0.1:<porta>/metrics")
+    parser.add_argument('--metrics-json', default=None, help="grava instantâneos JSON das métricas neste arquivo")
+    parser.add_argument('--profile', type=int, default=None, metavar='N',
+                        help="mede as etapas em 1 de cada N iterações; SIGUSR1 grava o detalhamento")
+    args = parser.parse_args()
+
+    if args.ports == ['auto']:
+        from PortDiscovery import discover
+        found = discover()
+        if found is None:
+            parser.error("nenhum XBee encontrado")
+        args.ports, args.baudrate = [found['port']], found['baudrate']
+        print(f"XBee em {found['port']} a {found['baudrate']} baud", file=sys.stderr)
+    try:
+        sinks = [create_sink(spec) for spec in args.sink]
+    except ValueError as e:
+        parser.error(str(e))
+    daemon = CaptureDaemon(args.ports, args.baudrate, sinks, capture_log=not args.no_log, log_directory=args.log_dir,
+                           compression=None if args.compression == 'none' else args.compression)
+    if args.metrics_port is not None:
+        daemon.xbee.metrics.serve(args.metrics_port)
+    if args.metrics_json:
+        daemon.xbee.metrics.start_snapshots(args.metrics_json)
+    if args.profile:
+        daemon.xbee.enable_profiling(args.profile)
+    daemon.install_signal_handlers()
+    daemon.run()
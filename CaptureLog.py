@@ -0,0 +1,556 @@
+'''
+@file CaptureLog.py
+@brief Módulo para gravação contínua dos dados capturados do XBee.
+
+Este módulo fornece uma classe CaptureLog que grava em disco cada lote de
+quadros assim que ele é processado, por meio de uma escrita bufferizada com
+descargas periódicas, e mantém o relatório de erros em um arquivo separado.
+A classe RotatingCaptureLog divide a captura em segmentos por tamanho e por
+tempo, com nomes monotônicos e compressão gzip (ou zstd) durante a gravação.
+Fornece também a leitura sob demanda dos logs, comprimidos ou não (read_log),
+e uma classe LogIndex com o índice (instante -> deslocamento) de cada log,
+construído durante a captura ou uma única vez para os logs antigos, para
+consultas por intervalo de tempo sem percorrer o arquivo desde o início. Os
+logs comprimidos são gravados pela classe CompressedLogWriter em membros gzip
+(ou frames zstd) independentes, um por ponto de verificação do índice, de
+modo que a consulta também começa a descomprimir diretamente no ponto certo.
+
+Uso: python CaptureLog.py arquivo 'AAAA-MM-DD HH:MM:SS' ['AAAA-MM-DD HH:MM:SS']
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+from array import array
+from bisect import bisect_left, bisect_right
+import contextlib
+import gzip
+import io
+import os
+import re
+import struct
+import sys
+import time
+from PacketStore import ERROR_COMMAND, format_timestamp, parse_timestamp
+
+try:
+    import zstandard  # Opcional: só é necessário para logs .zst
+except ImportError:
+    zstandard = None
+
+'''Definição de Constantes'''
+BUFFER_SIZE = 64 * 1024
+FLUSH_INTERVAL = 1.0
+# Linha do log: instante (com ou sem fração de segundo), origem e quadros em hexadecimal
+LINE_PATTERN = re.compile(r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)(?:\.(\d{1,6}))? - (\w+): ([0-9A-Fa-f ]*)$', re.M)
+# Índice do log: um ponto de verificação (instante, deslocamento) a cada intervalo ou bloco de bytes
+INDEX_SUFFIX = '_indice.bin'
+CHECKPOINT_INTERVAL = 10.0
+CHECKPOINT_BYTES = 64 * 1024
+CHECKPOINT = struct.Struct('<qqq')  # Instante, deslocamento sem compressão, posição no arquivo (-1 se nenhuma)
+# Rotação: extensão de cada compressão e limites de cada segmento (bytes sem compressão, segundos)
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+SEGMENT_MAX_AGE = 3600.0
+ERROR_HEX = f"{ERROR_COMMAND:02X}"
+
+def log_stem(filename):
+    """Retorna o nome de um log sem as extensões de texto e de compressão (data_log_x.txt.gz -> data_log_x)."""
+    for extension in COMPRESSION_EXTENSIONS.values():
+        if filename.endswith(extension):
+            filename = filename[:-len(extension)]
+    return os.path.splitext(filename)[0]
+
+def is_compressed(filename):
+    """Indica se um log é comprimido, pela extensão."""
+    return filename.endswith(tuple(COMPRESSION_EXTENSIONS.values()))
+
+def require_zstandard(filename):
+    """Verifica se o pacote zstandard está disponível para um log .zst.
+
+    Raises:
+        ImportError: Se o log for .zst e o pacote zstandard não estiver instalado.
+    """
+    if filename.endswith(COMPRESSION_EXTENSIONS['zstd']) and zstandard is None:
+        raise ImportError("Logs .zst precisam do pacote zstandard (pip install zstandard)")
+
+def open_log(filename):
+    """Abre um log para leitura em modo binário, comprimido ou não, de acordo com a extensão.
+
+    Logs .gz e .zst são descomprimidos durante a leitura, sem arquivo
+    temporário, e podem ser lidos enquanto ainda estão sendo gravados.
+
+    Args:
+        filename (str): O arquivo de log (.txt, .txt.gz ou .txt.zst).
+
+    Returns:
+        Um objeto de arquivo binário.
+
+    Raises:
+        ImportError: Se o log for .zst e o pacote zstandard não estiver instalado.
+    """
+    require_zstandard(filename)
+    if filename.endswith(COMPRESSION_EXTENSIONS['gzip']):
+        return gzip.open(filename, 'rb')
+    if filename.endswith(COMPRESSION_EXTENSIONS['zstd']):
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(filename, 'rb'),
+                                                                            read_across_frames=True))
+    return open(filename, 'rb')
+
+@contextlib.contextmanager
+def open_log_at(filename, offset=0, position=0, position_offset=0):
+    """Abre um log para leitura a partir do início da linha em offset.
+
+    Nos logs comprimidos, a descompressão começa em position, o início de um
+    membro gzip (ou frame zstd) cujo primeiro byte sem compressão está em
+    position_offset, e apenas os offset - position_offset bytes seguintes são
+    descartados. Nos logs sem compressão, a leitura vai direto para offset.
+
+    Args:
+        filename (str): O arquivo de log.
+        offset (int): Posição, em bytes e sem compressão, do início de uma linha.
+        position (int): Posição, no arquivo comprimido, de um membro até offset.
+        position_offset (int): Posição sem compressão do início desse membro.
+
+    Yields:
+        Um objeto de arquivo binário posicionado em offset.
+    """
+    require_zstandard(filename)
+    with open(filename, 'rb') as raw:
+        if filename.endswith(COMPRESSION_EXTENSIONS['gzip']):
+            raw.seek(position)
+            file, skip = gzip.GzipFile(fileobj=raw), offset - position_offset
+        elif filename.endswith(COMPRESSION_EXTENSIONS['zstd']):
+            raw.seek(position)
+            file = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True,
+                                                                                closefd=False))
+            skip = offset - position_offset
+        else:
+            file, skip = raw, offset
+        with file:
+            seek_forward(file, skip)
+            yield file
+
+def read_log(filename, offset=0, position=0, position_offset=0):
+    """Lê um arquivo de log sob demanda, uma linha por vez.
+
+    Nada é carregado antecipadamente, de modo que a leitura de um log de
+    vários gigabytes começa imediatamente; logs comprimidos são
+    descomprimidos durante a leitura. Linhas fora do formato ou com
+    hexadecimal corrompido são ignoradas, e a leitura de um log comprimido
+    ainda em gravação termina na última linha completa.
+
+    Args:
+        filename (str): O arquivo de log.
+        offset (int): Posição, em bytes e sem compressão, do início de uma
+            linha a partir da qual ler.
+        position (int): Nos logs comprimidos, posição no arquivo de um membro
+            até offset em que a descompressão começa (veja open_log_at).
+        position_offset (int): Posição sem compressão do início desse membro.
+
+    Yields:
+        tuple: (timestamp_ns, source, data), com os bytes da linha em data.
+    """
+    with open_log_at(filename, offset, position, position_offset) as file:
+        for line in iter_complete_lines(file):
+            match = LINE_PATTERN.match(line.rstrip(b'\r\n').decode('latin-1'))
+            if match is None:
+                continue
+            date, fraction, source, text = match.groups()
+            try:
+                data = bytes.fromhex(text)
+            except ValueError:
+                continue
+            yield parse_timestamp(f"{date}.{fraction}" if fraction else date), source, data
+
+def seek_forward(file, offset):
+    """Posiciona a leitura em offset, descartando os bytes anteriores se o fluxo não permitir seek."""
+    if file.seekable():
+        file.seek(offset)
+        return
+    while offset > 0:
+        skipped = len(file.read(min(offset, BUFFER_SIZE)))
+        if not skipped:
+            return
+        offset -= skipped
+
+def iter_complete_lines(file):
+    """Percorre as linhas de um arquivo, parando sem erro no fim de um log comprimido incompleto."""
+    try:
+        yield from file
+    except EOFError:
+        return  # Compressão ainda sem o marcador de fim: log em gravação
+
+class LogIndex:
+    """Classe para o índice de um arquivo de log: pontos de verificação (instante, deslocamento).
+
+    O índice fica em um arquivo ao lado do log (<log>_indice.bin), com um
+    registro de 24 bytes a cada CHECKPOINT_INTERVAL segundos ou CHECKPOINT_BYTES
+    bytes de log: o instante, o deslocamento sem compressão e, nos logs
+    comprimidos, a posição no arquivo do membro gzip (ou frame zstd) iniciado
+    naquela linha pelo CaptureLog (-1 nos pontos de verificação sem membro
+    próprio, como os de um log antigo indexado depois). Uma consulta por
+    intervalo de tempo faz uma busca binária nos pontos de verificação,
+    posiciona a leitura diretamente no ponto anterior ao início e lê apenas as
+    linhas seguintes. Supõe que o log foi gravado em ordem cronológica, como
+    faz a captura.
+    """
+
+    def __init__(self, log_filename, interval=CHECKPOINT_INTERVAL, max_bytes=CHECKPOINT_BYTES):
+        """Inicializa uma nova instância de LogIndex e carrega o índice já gravado, se houver.
+
+        Args:
+            log_filename (str): O arquivo de log.
+            interval (float): Intervalo máximo, em segundos de log, entre pontos de verificação.
+            max_bytes (int): Quantidade máxima de bytes de log entre pontos de verificação.
+        """
+        self.log_filename = log_filename
+        self.filename = f"{log_stem(log_filename)}{INDEX_SUFFIX}"
+        self.interval_ns = int(interval * 1e9)
+        self.max_bytes = max_bytes
+        self.compressed = is_compressed(log_filename)
+        self.timestamps = array('q')
+        self.offsets = array('q')
+        self.positions = array('q')
+        self.pending = bytearray()
+        if os.path.exists(self.filename):
+            with open(self.filename, 'rb') as file:
+                data = file.read()
+            # Um registro incompleto no fim (gravação interrompida) é ignorado
+            complete = len(data) - len(data) % CHECKPOINT.size
+            for timestamp_ns, offset, position in CHECKPOINT.iter_unpack(data[:complete]):
+                self.timestamps.append(timestamp_ns)
+                self.offsets.append(offset)
+                self.positions.append(position)
+            log_size = os.path.getsize(log_filename) if os.path.exists(log_filename) else 0
+            if self.positions and max(self.positions) > log_size:
+                # Índice de outro arquivo com o mesmo nome: descartado e refeito
+                del self.timestamps[:], self.offsets[:], self.positions[:]
+                open(self.filename, 'wb').close()
+
+    def due(self, timestamp_ns, offset):
+        """Indica se uma linha seria registrada por add (o intervalo ou o bloco expirou).
+
+        Args:
+            timestamp_ns (int): O instante da linha, em nanossegundos.
+            offset (int): A posição da linha no log, em bytes.
+        """
+        if not self.offsets:
+            return True
+        if offset <= self.offsets[-1]:
+            return False
+        return timestamp_ns - self.timestamps[-1] >= self.interval_ns or offset - self.offsets[-1] >= self.max_bytes
+
+    def add(self, timestamp_ns, offset, position=-1):
+        """Registra o início de uma linha como ponto de verificação, se o intervalo ou o bloco expirou.
+
+        Todas as linhas antes de offset devem ter instante menor ou igual a timestamp_ns.
+
+        Args:
+            timestamp_ns (int): O instante da linha, em nanossegundos.
+            offset (int): A posição da linha no log, em bytes (sem compressão).
+            position (int): Nos logs comprimidos, a posição no arquivo de um
+                membro iniciado nesta linha, ou -1. Ignorada nos logs sem compressão.
+        """
+        if not self.due(timestamp_ns, offset):
+            return
+        if not self.compressed:
+            position = offset
+        self.timestamps.append(timestamp_ns)
+        self.offsets.append(offset)
+        self.positions.append(position)
+        self.pending += CHECKPOINT.pack(timestamp_ns, offset, position)
+
+    def flush(self):
+        """Grava no arquivo de índice os pontos de verificação pendentes."""
+        if self.pending:
+            with open(self.filename, 'ab') as file:
+                file.write(self.pending)
+            self.pending.clear()
+
+    def update(self):
+        """Indexa as linhas gravadas após o último ponto de verificação.
+
+        Na primeira chamada para um log antigo, sem índice, o arquivo inteiro é
+        percorrido uma única vez; depois, apenas o trecho novo. Só o prefixo de
+        data de cada linha é examinado, e os pontos de verificação caem sempre
+        na primeira linha de um novo segundo.
+
+        Returns:
+            int: O tamanho do log sem compressão, em bytes (0 se ele não existe).
+        """
+        if not os.path.exists(self.log_filename):
+            return 0
+        offset = self.offsets[-1] if self.offsets else 0
+        prefix = None
+        with open_log_at(self.log_filename, offset, *self.restart_point(offset)) as file:
+            for line in iter_complete_lines(file):
+                head = line[:19]
+                if head != prefix:
+                    prefix = head
+                    try:
+                        self.add(parse_timestamp(head.decode('latin-1')), offset)
+                    except ValueError:
+                        pass  # Linha fora do formato (cabeçalho do relatório, por exemplo)
+                offset += len(line)
+        self.flush()
+        return offset
+
+    def seek_offset(self, start_ns):
+        """Retorna a posição a partir da qual estão todas as linhas com instante >= start_ns."""
+        position = bisect_left(self.timestamps, start_ns) - 1
+        return self.offsets[position] if position >= 0 else 0
+
+    def restart_point(self, offset):
+        """Retorna onde a leitura do arquivo pode começar para chegar a offset.
+
+        Returns:
+            tuple: (posição no arquivo, deslocamento sem compressão) do último
+            ponto de verificação até offset com posição conhecida; (0, 0), o
+            início do arquivo, se não houver.
+        """
+        index = bisect_right(self.offsets, offset) - 1
+        while index >= 0 and self.positions[index] < 0:
+            index -= 1
+        return (self.positions[index], self.offsets[index]) if index >= 0 else (0, 0)
+
+    def query(self, start, end=None):
+        """Lê apenas as linhas de um intervalo de tempo.
+
+        Args:
+            start: Início do intervalo, em nanossegundos ou como 'AAAA-MM-DD HH:MM:SS[.fff]'.
+            end: Fim do intervalo (inclusive), no mesmo formato; até o fim do log se None.
+
+        Yields:
+            tuple: (timestamp_ns, source, data) de cada linha do intervalo.
+        """
+        if isinstance(start, str):
+            start = parse_timestamp(start)
+        if isinstance(end, str):
+            end = parse_timestamp(end)
+        offset = self.seek_offset(start)
+        for line in read_log(self.log_filename, offset, *self.restart_point(offset)):
+            if end is not None and line[0] > end:
+                return
+            if line[0] >= start:
+                yield line
+
+class CompressedLogWriter:
+    """Classe para gravação de um log comprimido em membros gzip (ou frames zstd) independentes.
+
+    Cada membro pode ser descomprimido sem os anteriores. O CaptureLog inicia um
+    membro a cada ponto de verificação do índice, e a posição do membro no
+    arquivo vai para o índice, de modo que uma consulta não precisa
+    descomprimir o log desde o início.
+    """
+
+    encoding = 'utf-8'
+
+    def __init__(self, filename):
+        """Inicializa uma nova instância de CompressedLogWriter e abre o arquivo para acrescentar.
+
+        Args:
+            filename (str): O arquivo de log (.txt.gz ou .txt.zst).
+
+        Raises:
+            ImportError: Se o log for .zst e o pacote zstandard não estiver instalado.
+        """
+        require_zstandard(filename)
+        self.filename = filename
+        self.raw = open(filename, 'ab')
+        self.stream = None
+
+    @property
+    def closed(self):
+        """Indica se o arquivo foi fechado."""
+        return self.raw.closed
+
+    def start_member(self):
+        """Encerra o membro atual e inicia um novo.
+
+        Returns:
+            int: A posição do novo membro no arquivo.
+        """
+        self.end_member()
+        position = self.raw.tell()
+        if self.filename.endswith(COMPRESSION_EXTENSIONS['gzip']):
+            self.stream = gzip.GzipFile(fileobj=self.raw, mode='ab')
+        else:
+            self.stream = zstandard.ZstdCompressor().stream_writer(self.raw, closefd=False)
+        return position
+
+    def end_member(self):
+        """Encerra o membro atual, se houver, sem fechar o arquivo."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def write(self, text):
+        """Comprime e grava um texto no membro atual (iniciado se necessário)."""
+        if self.stream is None:
+            self.start_member()
+        self.stream.write(text.encode(self.encoding))
+
+    def flush(self):
+        """Descarrega o compressor e o arquivo; o log pode ser lido até aqui."""
+        if self.stream is not None:
+            self.stream.flush()
+        self.raw.flush()
+
+    def close(self):
+        """Encerra o membro atual e fecha o arquivo."""
+        if not self.raw.closed:
+            self.end_member()
+            self.raw.close()
+
+class CaptureLog:
+    """Classe para gravação contínua dos quadros capturados em um arquivo de texto."""
+
+    def __init__(self, filename, buffer_size=BUFFER_SIZE, flush_interval=FLUSH_INTERVAL):
+        """Inicializa uma nova instância de CaptureLog e abre o arquivo para escrita.
+
+        Args:
+            filename (str): O arquivo de log.
+            buffer_size (int): Tamanho, em bytes, do buffer de escrita.
+            flush_interval (float): Intervalo máximo, em segundos, entre descargas para o disco.
+        """
+        self.summary_filename = f"{log_stem(filename)}_resumo.txt"
+        self.segments = []  # Arquivos de log gravados por esta instância
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.line_count = 0
+        self.error_count = 0
+        self.open_file(filename)
+        self.last_flush = time.monotonic()
+
+    def open_file(self, filename):
+        """Abre o arquivo de log para acrescentar linhas, com o seu índice.
+
+        Args:
+            filename (str): O arquivo de log; .txt.gz ou .txt.zst para gravar comprimido.
+        """
+        self.filename = filename
+        if filename not in self.segments:
+            self.segments.append(filename)
+        self.index = LogIndex(filename)
+        # Um log já existente é indexado antes de receber novas linhas
+        self.offset = self.index.update()
+        if self.index.compressed:
+            self.file = CompressedLogWriter(filename)
+        else:
+            self.file = open(filename, 'a', buffering=self.buffer_size, newline='\n')
+
+    def write_frames(self, batch):
+        """Grava um lote de dados e descarrega o buffer se o intervalo tiver expirado.
+
+        Args:
+            batch (list[dict]): Os dados com as chaves 'source', 'data' e 'timestamp'.
+        """
+        if batch:
+            text = ''.join(f"{data['timestamp']} - {data['source']}: {data['data']}\n" for data in batch)
+            timestamp_ns = parse_timestamp(batch[0]['timestamp'])
+            if self.index.due(timestamp_ns, self.offset):
+                # Nos logs comprimidos, cada ponto de verificação começa um membro, lido sem os anteriores
+                self.index.add(timestamp_ns, self.offset, self.file.start_member() if self.index.compressed else -1)
+            self.file.write(text)
+            self.offset += len(text.encode(self.file.encoding))
+            self.line_count += len(batch)
+            # Quadros de erro: byte de comando (o segundo, 'AB E1 ...') igual a E1, como no PacketStore
+            self.error_count += sum(data['data'][3:5] == ERROR_HEX for data in batch)
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Descarrega o buffer de escrita e os pontos de verificação pendentes para o disco."""
+        self.file.flush()
+        self.index.flush()
+        self.last_flush = time.monotonic()
+
+    def write_summary(self):
+        """Grava o relatório de erros no arquivo de resumo, ao lado do log.
+
+        Returns:
+            str: O nome do arquivo de resumo.
+        """
+        numero_linhas = self.line_count + 1
+        with open(self.summary_filename, 'w') as file:
+            file.write(f"{'-'*50}\n")
+            file.write(f"{'-'*50}\n")
+            file.write(f"Arquivo de Log: {', '.join(os.path.basename(name) for name in self.segments)}\n")
+            file.write(f"Quantidade de Erros de Pacote: {self.error_count}\n")
+            file.write(f"Quantidade de Linhas: {numero_linhas}\n")
+            file.write(f"Porcentagem de erro: {(self.error_count/numero_linhas)*100}%\n")
+            file.write(f"{'-'*50}\n")
+            file.write(f"{'-'*50}\n")
+        return self.summary_filename
+
+    def close(self):
+        """Descarrega o buffer e fecha o arquivo de log."""
+        if not self.file.closed:
+            self.file.close()
+            self.index.flush()
+
+class RotatingCaptureLog(CaptureLog):
+    """Classe para gravação contínua em segmentos de log rotacionados e, opcionalmente, comprimidos.
+
+    Os segmentos de uma sessão se chamam <base>_<AAAAMMDD-HHMMSS>-<pid>_<NNNN>.txt[.gz|.zst]:
+    o nome é obtido sem consultar o disco, cresce monotonicamente (a ordem
+    alfabética é a ordem cronológica) e não colide com outra instância em
+    execução. Um novo segmento é iniciado quando o atual atinge max_bytes
+    bytes sem compressão ou max_age segundos. O resumo cobre a sessão inteira.
+    """
+
+    def __init__(self, directory='.', filename_base='data_log', compression='gzip', max_bytes=SEGMENT_MAX_BYTES,
+                 max_age=SEGMENT_MAX_AGE, buffer_size=BUFFER_SIZE, flush_interval=FLUSH_INTERVAL):
+        """Inicializa uma nova instância de RotatingCaptureLog e abre o primeiro segmento.
+
+        Args:
+            directory (str): O diretório dos segmentos.
+            filename_base (str): Prefixo do nome dos segmentos.
+            compression (str): 'gzip', 'zstd' (requer o pacote zstandard) ou None para texto puro.
+            max_bytes (int): Tamanho máximo de um segmento, em bytes sem compressão; sem limite se None.
+            max_age (float): Duração máxima de um segmento, em segundos; sem limite se None.
+            buffer_size (int): Tamanho, em bytes, do buffer de escrita.
+            flush_interval (float): Intervalo máximo, em segundos, entre descargas para o disco.
+
+        Raises:
+            ValueError: Se a compressão for desconhecida.
+        """
+        if compression is not None and compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Compressão desconhecida: {compression}")
+        self.prefix = os.path.join(directory, f"{filename_base}_{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+        self.extension = '.txt' + (COMPRESSION_EXTENSIONS[compression] if compression else '')
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.segment = 0
+        CaptureLog.__init__(self, self.segment_filename(), buffer_size, flush_interval)
+        self.summary_filename = f"{self.prefix}_resumo.txt"
+
+    def segment_filename(self):
+        """Retorna o nome do segmento atual."""
+        return f"{self.prefix}_{self.segment:04d}{self.extension}"
+
+    def open_file(self, filename):
+        """Abre um segmento e registra o seu instante de abertura."""
+        CaptureLog.open_file(self, filename)
+        self.segment_start = time.monotonic()
+
+    def rotate(self):
+        """Fecha o segmento atual e inicia o próximo."""
+        self.close()
+        self.segment += 1
+        self.open_file(self.segment_filename())
+
+    def write_frames(self, batch):
+        """Inicia um novo segmento se o atual atingiu o limite e grava o lote nele."""
+        if batch and ((self.max_bytes and self.offset >= self.max_bytes)
+                      or (self.max_age and time.monotonic() - self.segment_start >= self.max_age)):
+            self.rotate()
+        CaptureLog.write_frames(self, batch)
+
+if __name__ == "__main__":
+    index = LogIndex(sys.argv[1])
+    index.update()
+    for timestamp_ns, source, data in index.query(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None):
+        print(f"{format_timestamp(timestamp_ns)} - {source}: {data.hex(' ').upper()}")
@@ -0,0 +1,114 @@
+'''
+@file FrameParser.py
+@brief Módulo para separação de quadros delimitados recebidos do XBee.
+
+Este módulo fornece uma classe FrameParser que recebe o fluxo de bytes lido da
+porta serial, em blocos de qualquer tamanho, e separa os quadros no formato
+AB ... CD assim que o byte final de cada um chega.
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Definição de Constantes'''
+FRAME_START = 0xAB
+FRAME_END = 0xCD
+MAX_FRAME_SIZE = 64
+
+class FrameParser:
+    """Classe para separar quadros AB ... CD de um fluxo contínuo de bytes."""
+
+    def __init__(self, start=FRAME_START, end=FRAME_END, max_frame_size=MAX_FRAME_SIZE):
+        """Inicializa uma nova instância de FrameParser.
+
+        Args:
+            start (int): Byte que marca o início de um quadro.
+            end (int): Byte que marca o fim de um quadro.
+            max_frame_size (int): Tamanho máximo de um quadro, incluindo os delimitadores.
+                Um início sem fim dentro desse limite é descartado como lixo.
+        """
+        self.start = start
+        self.end = end
+        self.max_frame_size = max_frame_size
+        self.buffer = bytearray()
+        self.frame_count = 0
+        self.resync_count = 0
+        self.discarded_bytes = 0
+        self.discarding = False  # Se está descartando bytes desde o último quadro válido, entre blocos
+
+    def reset(self):
+        """Descarta o quadro parcial pendente."""
+        self.buffer.clear()
+        self.discarding = False
+
+    def feed(self, chunk):
+        """Processa um bloco de bytes e retorna os quadros completos encontrados.
+
+        Args:
+            chunk (bytes): Bloco de bytes lido da porta serial.
+
+        Returns:
+            list[bytes]: Os quadros completos, com os delimitadores.
+        """
+        frames = []
+        self.scan(chunk, lambda frame: frames.append(bytes(frame)))
+        return frames
+
+    def scan(self, chunk, callback):
+        """Processa um bloco de bytes chamando callback para cada quadro completo.
+
+        Quadros divididos entre blocos são mantidos no buffer interno até que o
+        byte final chegue. Bytes fora de um quadro são descartados; cada
+        sequência contínua de bytes descartados, mesmo dividida entre blocos,
+        conta como um evento de ressincronização. O quadro é entregue como uma
+        memoryview sobre o buffer interno, válida apenas durante a chamada, o
+        que evita uma cópia por quadro quando o destino já é pré-alocado.
+
+        Args:
+            chunk (bytes): Bloco de bytes lido da porta serial.
+            callback: Função chamada com a memoryview de cada quadro.
+
+        Returns:
+            int: A quantidade de quadros encontrados.
+        """
+        buffer = self.buffer
+        buffer.extend(chunk)
+        count = 0
+        pos = 0
+        size = len(buffer)
+        with memoryview(buffer) as view:
+            while pos < size:
+                start = buffer.find(self.start, pos)
+                if start == -1:
+                    self._discard(size - pos)
+                    pos = size
+                    break
+                if start > pos:
+                    self._discard(start - pos)
+                pos = start
+                end = buffer.find(self.end, pos + 1, pos + self.max_frame_size)
+                if end == -1:
+                    if size - pos < self.max_frame_size:
+                        # Quadro incompleto: aguarda o próximo bloco
+                        break
+                    # Início sem fim dentro do limite: procura o próximo início
+                    self._discard(1)
+                    pos += 1
+                    continue
+                callback(view[pos:end + 1])
+                self.discarding = False
+                count += 1
+                pos = end + 1
+        del buffer[:pos]
+        self.frame_count += count
+        return count
+
+    def _discard(self, count):
+        """Contabiliza bytes descartados; só a passagem para o descarte conta como ressincronização.
+
+        Uma sequência de lixo dividida entre vários blocos conta uma única vez.
+        """
+        if not self.discarding:
+            self.discarding = True
+            self.resync_count += 1
+        self.discarded_bytes += count
@@ -0,0 +1,102 @@
+'''
+@file FrameRing.py
+@brief Módulo com o buffer circular de quadros entre a leitura serial e os consumidores.
+
+Este módulo fornece uma classe FrameRing, um buffer circular de capacidade fixa
+com um único produtor (a thread de leitura serial) e um único consumidor, que
+retira os quadros em lotes e os repassa para a interface, o log e as análises.
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+from array import array
+from FrameParser import MAX_FRAME_SIZE
+
+'''Definição de Constantes'''
+RING_CAPACITY = 4096
+
+class FrameRing:
+    """Classe para troca de quadros entre um produtor e um consumidor sem lock.
+
+    Os espaços dos quadros são alocados uma única vez na criação. O produtor só
+    escreve em head e o consumidor só escreve em tail; como ambos são contadores
+    crescentes atualizados depois da cópia dos dados, cada lado enxerga apenas
+    quadros completos sem precisar de um lock.
+    """
+
+    def __init__(self, capacity=RING_CAPACITY, max_frame_size=MAX_FRAME_SIZE):
+        """Inicializa uma nova instância de FrameRing.
+
+        Args:
+            capacity (int): Quantidade máxima de quadros armazenados.
+            max_frame_size (int): Tamanho máximo, em bytes, de cada quadro.
+        """
+        self.capacity = capacity
+        self.max_frame_size = max_frame_size
+        self.slots = [bytearray(max_frame_size) for _ in range(capacity)]
+        self.lengths = array('H', [0]) * capacity
+        self.timestamps = array('q', [0]) * capacity
+        self.monotonic = array('q', [0]) * capacity
+        self.sources = array('H', [0]) * capacity
+        self.head = 0
+        self.tail = 0
+        self.high_water_mark = 0
+        self.overflow_count = 0
+
+    def __len__(self):
+        """Retorna a quantidade de quadros aguardando consumo."""
+        return self.head - self.tail
+
+    def push(self, frame, timestamp_ns, monotonic_ns=0, source=0):
+        """Copia um quadro para o próximo espaço livre (lado do produtor).
+
+        Args:
+            frame: Os bytes do quadro (bytes, bytearray ou memoryview).
+            timestamp_ns (int): Instante de recebimento (time.time_ns).
+            monotonic_ns (int): Instante de recebimento (time.monotonic_ns).
+            source (int): Índice da porta de origem do quadro.
+
+        Returns:
+            bool: False se o buffer estava cheio ou o quadro excede o tamanho
+            máximo; nesse caso o quadro é descartado e contado em overflow_count.
+        """
+        head = self.head
+        depth = head - self.tail
+        size = len(frame)
+        if depth >= self.capacity or size > self.max_frame_size:
+            self.overflow_count += 1
+            return False
+        index = head % self.capacity
+        self.slots[index][:size] = frame
+        self.lengths[index] = size
+        self.timestamps[index] = timestamp_ns
+        self.monotonic[index] = monotonic_ns
+        self.sources[index] = source
+        self.head = head + 1
+        if depth + 1 > self.high_water_mark:
+            self.high_water_mark = depth + 1
+        return True
+
+    def drain(self, max_items=None):
+        """Retira um lote de quadros do buffer (lado do consumidor).
+
+        Args:
+            max_items (int): Quantidade máxima de quadros retirados; todos se None.
+
+        Returns:
+            list[tuple]: Tuplas (frame, timestamp_ns, monotonic_ns, source), do mais
+            antigo para o mais novo.
+        """
+        tail = self.tail
+        count = self.head - tail
+        if max_items is not None and count > max_items:
+            count = max_items
+        batch = []
+        for position in range(tail, tail + count):
+            index = position % self.capacity
+            batch.append((bytes(self.slots[index][:self.lengths[index]]), self.timestamps[index],
+                          self.monotonic[index], self.sources[index]))
+        self.tail = tail + count
+        return batch
@@ -0,0 +1,181 @@
+'''
+@file LiveChart.py
+@brief Módulo com os gráficos em tempo real da captura.
+
+Este módulo fornece uma classe LiveChart, um tk.Canvas que desenha uma série
+como uma única linha (atualizada com coords, sem recriar os itens), e uma
+classe LiveCharts, o painel com os gráficos de quadros/s, fração de quadros de
+erro e valor do payload. Os quadros são agregados em RollingSeries e cada
+gráfico desenha no máximo MAX_POINTS pontos reduzidos por lttb, de modo que o
+custo de cada atualização não depende da duração da sessão.
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import time
+import tkinter as tk
+from tkinter import ttk
+from TimeSeries import RollingSeries, MAX_POINTS
+
+'''Definição de Constantes'''
+VALUE_OFFSET = 3  # Primeiro byte de payload, depois de AB, comando e 0x10 (como em LogAnalytics)
+RECENT_WINDOW = 600.0  # Janela do modo "Últimos 10 min", em segundos
+MARGIN_LEFT = 56
+MARGIN_RIGHT = 10
+MARGIN_TOP = 20
+MARGIN_BOTTOM = 18
+# Gráficos do painel: (série de RollingSeries, título, formato dos valores do eixo y, eixo a partir de zero)
+CHARTS = (
+    ('rate', "Quadros/s", "{:.1f}", True),
+    ('error_ratio', "Quadros de erro", "{:.1%}", True),
+    ('value', "Valor do payload (média)", "{:.1f}", False),
+)
+
+def format_time(timestamp, span):
+    """Formata um instante do eixo x, com a data quando o gráfico cobre mais de um dia."""
+    return time.strftime('%d/%m %H:%M' if span > 86400 else '%H:%M:%S', time.localtime(timestamp))
+
+class LiveChart(tk.Canvas):
+    """Classe para um gráfico de linha desenhado diretamente em um tk.Canvas."""
+
+    def __init__(self, master, title, value_format="{:.1f}", zero_based=True, height=120, **kwargs):
+        """Inicializa uma nova instância de LiveChart.
+
+        Args:
+            master: O widget pai.
+            title (str): O título do gráfico.
+            value_format (str): Formato dos valores do eixo y.
+            zero_based (bool): Se o eixo y começa em zero.
+            height (int): A altura inicial, em pixels.
+            kwargs: Argumentos de palavra-chave repassados ao tk.Canvas.
+        """
+        tk.Canvas.__init__(self, master, height=height, background='white', highlightthickness=0, **kwargs)
+        self.value_format = value_format
+        self.zero_based = zero_based
+        self.frame = self.create_rectangle(0, 0, 0, 0, outline='gray')
+        self.line = self.create_line(0, 0, 0, 0, fill='steelblue', width=1.5, state=tk.HIDDEN)
+        self.title = self.create_text(MARGIN_LEFT, 3, anchor='nw', text=title)
+        self.y_max = self.create_text(MARGIN_LEFT - 4, MARGIN_TOP, anchor='e')
+        self.y_min = self.create_text(MARGIN_LEFT - 4, 0, anchor='e')
+        self.x_start = self.create_text(MARGIN_LEFT, 0, anchor='sw')
+        self.x_end = self.create_text(0, 0, anchor='se')
+
+    def plot(self, xs, ys):
+        """Desenha uma série, ajustando os eixos aos seus limites.
+
+        Args:
+            xs (list[float]): Os instantes, em segundos desde a época Unix.
+            ys (list[float]): Os valores.
+        """
+        width, height = self.winfo_width(), self.winfo_height()
+        left, top = MARGIN_LEFT, MARGIN_TOP
+        right, bottom = width - MARGIN_RIGHT, height - MARGIN_BOTTOM
+        self.coords(self.frame, left, top, right, bottom)
+        self.coords(self.y_min, left - 4, bottom)
+        self.coords(self.x_start, left, height)
+        self.coords(self.x_end, right, height)
+        if len(xs) < 2 or right <= left or bottom <= top:
+            self.itemconfigure(self.line, state=tk.HIDDEN)
+            for item in (self.y_max, self.y_min, self.x_start, self.x_end):
+                self.itemconfigure(item, text='')
+            return
+        low = min(0.0, min(ys)) if self.zero_based else min(ys)
+        high = max(ys)
+        if high <= low:
+            high = low + 1
+        x_scale = (right - left) / ((xs[-1] - xs[0]) or 1)
+        y_scale = (bottom - top) / (high - low)
+        points = []
+        for x, y in zip(xs, ys):
+            points.append(left + (x - xs[0]) * x_scale)
+            points.append(bottom - (y - low) * y_scale)
+        self.coords(self.line, *points)
+        self.itemconfigure(self.line, state=tk.NORMAL)
+        span = xs[-1] - xs[0]
+        self.itemconfigure(self.y_max, text=self.value_format.format(high))
+        self.itemconfigure(self.y_min, text=self.value_format.format(low))
+        self.itemconfigure(self.x_start, text=format_time(xs[0], span))
+        self.itemconfigure(self.x_end, text=format_time(xs[-1], span))
+
+class LiveCharts(ttk.Frame):
+    """Classe para o painel com os gráficos de quadros/s, erros e valor do payload."""
+
+    def __init__(self, master, value_offset=VALUE_OFFSET, max_points=MAX_POINTS, **kwargs):
+        """Inicializa uma nova instância de LiveCharts.
+
+        Args:
+            master: O widget pai.
+            value_offset (int): Posição, no quadro, do byte exibido no gráfico de valor.
+            max_points (int): Quantidade máxima de pontos desenhados por gráfico.
+            kwargs: Argumentos de palavra-chave repassados ao ttk.Frame.
+        """
+        ttk.Frame.__init__(self, master, **kwargs)
+        self.value_offset = value_offset
+        self.max_points = max_points
+        self.series = {"Sessão inteira": RollingSeries(), "Últimos 10 min": RollingSeries(window=RECENT_WINDOW)}
+        # Menor largura de faixa entre as séries: os quadros de um lote são somados nessa resolução
+        self.group_width = min(series.bin_width for series in self.series.values())
+
+        self.range_var = tk.StringVar(value="Últimos 10 min")
+        selector = ttk.Combobox(self, textvariable=self.range_var, values=list(self.series), state='readonly', width=16)
+        selector.bind('<<ComboboxSelected>>', lambda event: self.draw())
+        selector.pack(anchor='e')
+        self.charts = {}
+        for kind, title, value_format, zero_based in CHARTS:
+            chart = LiveChart(self, title, value_format, zero_based)
+            chart.pack(expand=True, fill='both', pady=2)
+            self.charts[kind] = chart
+
+    def add_packets(self, packets, first, end):
+        """Agrega os quadros [first, end) de um PacketStore em todas as séries.
+
+        Os quadros consecutivos da mesma faixa são somados antes de chegar às
+        séries, que recebem uma única chamada por faixa.
+
+        Args:
+            packets (PacketStore): O armazenamento dos quadros.
+            first (int): Índice absoluto do primeiro quadro.
+            end (int): Índice absoluto seguinte ao último quadro.
+        """
+        group = None
+        frames = errors = value_sum = value_count = 0
+        for index in range(first, end):
+            timestamp = packets.timestamp(index) / 1e9
+            key = int(timestamp / self.group_width)
+            if key != group:
+                if frames:
+                    self.add_group(group_time, frames, errors, value_sum, value_count)
+                group, group_time = key, timestamp
+                frames = errors = value_sum = value_count = 0
+            frames += 1
+            if packets.is_error(index):
+                errors += 1
+            else:
+                value = packets.payload_byte(index, self.value_offset)
+                if value is not None:
+                    value_sum += value
+                    value_count += 1
+        if frames:
+            self.add_group(group_time, frames, errors, value_sum, value_count)
+
+    def add_group(self, timestamp, frames, errors, value_sum, value_count):
+        """Soma um grupo de quadros da mesma faixa em todas as séries."""
+        for series in self.series.values():
+            series.add(timestamp, frames, errors, value_sum, value_count)
+
+    def clear(self):
+        """Descarta os dados agregados e limpa os gráficos."""
+        for series in self.series.values():
+            series.clear()
+        self.draw()
+
+    def draw(self):
+        """Redesenha os gráficos da série selecionada, se o painel estiver visível."""
+        if not self.winfo_ismapped():
+            return
+        series = self.series[self.range_var.get()]
+        now = time.time()
+        for kind, chart in self.charts.items():
+            chart.plot(*series.downsampled(kind, self.max_points, now))
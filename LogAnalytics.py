@@ -0,0 +1,281 @@
+'''
+@file LogAnalytics.py
+@brief Módulo para análise vetorizada dos arquivos de log capturados.
+
+Este módulo fornece uma classe LogAnalytics que carrega arquivos data_log*.txt (ou .txt.gz),
+com ou sem milissegundos no instante e com ou sem o cabeçalho do relatório, em
+arrays NumPy, e calcula a classificação dos quadros pelo byte de comando, a
+taxa real de quadros de erro, as estatísticas do intervalo entre chegadas e o
+histograma dos bytes de payload.
+
+Uso: python LogAnalytics.py [arquivo_ou_diretorio ...]
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import glob
+import os
+import sys
+import time
+import numpy as np
+from CaptureLog import LINE_PATTERN, open_log
+from FrameParser import FRAME_START, FRAME_END, MAX_FRAME_SIZE
+from PacketStore import ERROR_COMMAND
+
+'''Definição de Constantes'''
+DEFAULT_ARCHIVE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Versões Anteriores', 'XBEE PY_3')
+PAYLOAD_OFFSET = 3  # Bytes AB, comando e 0x10 antes do payload
+
+def _fromhex(text):
+    """Converte uma sequência hexadecimal em bytes, ignorando linhas corrompidas."""
+    try:
+        return bytes.fromhex(text)
+    except ValueError:
+        return b''
+
+def _frame_spans(data, offset):
+    """Localiza os quadros de uma linha com as mesmas regras do FrameParser.
+
+    Args:
+        data (bytes): Os bytes da linha.
+        offset (int): Posição da linha no buffer concatenado.
+
+    Returns:
+        list[tuple]: Pares (início, fim) absolutos de cada quadro.
+    """
+    spans = []
+    pos = 0
+    while True:
+        start = data.find(FRAME_START, pos)
+        if start == -1:
+            return spans
+        end = data.find(FRAME_END, start + 1, start + MAX_FRAME_SIZE)
+        if end == -1:
+            pos = start + 1
+            continue
+        spans.append((offset + start, offset + end))
+        pos = end + 1
+
+def find_logs(directory, pattern='data_log*.txt*'):
+    """Retorna os arquivos de log de um diretório, comprimidos ou não, ordenados, exceto os resumos."""
+    return sorted(path for path in glob.glob(os.path.join(directory, pattern))
+                  if not path.endswith('_resumo.txt'))
+
+class LogAnalytics:
+    """Classe para análise vetorizada de capturas gravadas em arquivos de log."""
+
+    def __init__(self, line_time_ns, line_file, data, line_offsets, filenames):
+        """Inicializa uma nova instância de LogAnalytics a partir dos arrays das linhas.
+
+        Em geral a instância é criada por from_files.
+
+        Args:
+            line_time_ns (numpy.ndarray): Instante de cada linha, em nanossegundos (int64).
+            line_file (numpy.ndarray): Índice do arquivo de cada linha.
+            data (numpy.ndarray): Bytes de todas as linhas concatenados (uint8).
+            line_offsets (numpy.ndarray): Início de cada linha em data, com um elemento a mais.
+            filenames (list[str]): Os arquivos carregados.
+        """
+        self.line_time_ns = line_time_ns
+        self.line_file = line_file
+        self.data = data
+        self.line_offsets = line_offsets
+        self.filenames = filenames
+        self._split_frames()
+
+    @classmethod
+    def from_files(cls, paths):
+        """Carrega um ou mais arquivos de log.
+
+        Args:
+            paths (list[str]): Arquivos de log.
+
+        Returns:
+            LogAnalytics: A instância com as linhas de todos os arquivos.
+        """
+        dates, fractions, chunks, files = [], [], [], []
+        for file_index, path in enumerate(paths):
+            with open_log(path) as file:
+                matches = LINE_PATTERN.findall(file.read().decode('latin-1').replace('\r\n', '\n'))
+            dates.extend(match[0] for match in matches)
+            fractions.extend(match[1] for match in matches)
+            chunks.extend(_fromhex(match[3]) for match in matches)
+            files.append(np.full(len(matches), file_index, dtype=np.int32))
+
+        # O instante de parede é lido como UTC e corrigido pelo deslocamento do horário local,
+        # calculado uma vez por hora distinta com as mesmas regras de parse_timestamp (mktime)
+        wall_seconds = np.array(dates, dtype='datetime64[s]').astype(np.int64)
+        hours, hour_index = np.unique(wall_seconds // 3600, return_inverse=True)
+        offsets = np.array([hour * 3600 - int(time.mktime(time.gmtime(hour * 3600)[:8] + (-1,)))
+                            for hour in hours.tolist()], dtype=np.int64)
+        seconds = wall_seconds - offsets[hour_index.reshape(-1)]
+        # Frações de segundo com 1 a 6 casas, convertidas para nanossegundos
+        fraction_ns = np.array([int(f.ljust(9, '0')) if f else 0 for f in fractions], dtype=np.int64)
+        lengths = np.fromiter((len(chunk) for chunk in chunks), dtype=np.int64, count=len(chunks))
+        line_offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=line_offsets[1:])
+        return cls(seconds * 1000000000 + fraction_ns,
+                   np.concatenate(files) if files else np.zeros(0, dtype=np.int32),
+                   np.frombuffer(b''.join(chunks), dtype=np.uint8),
+                   line_offsets,
+                   list(paths))
+
+    @classmethod
+    def from_directory(cls, directory=DEFAULT_ARCHIVE, pattern='data_log*.txt*'):
+        """Carrega todos os arquivos de log de um diretório, exceto os resumos."""
+        return cls.from_files(find_logs(directory, pattern))
+
+    def _split_frames(self):
+        """Separa os quadros AB ... CD de todas as linhas em uma passada vetorizada.
+
+        Um início é um byte AB no começo da linha ou logo após um CD, e cada
+        início é associado ao primeiro CD seguinte na mesma linha, como no
+        FrameParser. As poucas linhas que não ficam totalmente cobertas por
+        quadros (ruído na linha) são separadas novamente com as regras do
+        FrameParser; o que sobra é contado como bytes malformados.
+        """
+        data = self.data
+        size = len(data)
+        line_start = np.zeros(size, dtype=bool)
+        nonempty = self.line_offsets[:-1] < self.line_offsets[1:]
+        line_start[self.line_offsets[:-1][nonempty]] = True
+
+        is_end = data == FRAME_END
+        prev_end = np.zeros(size, dtype=bool)
+        prev_end[1:] = is_end[:-1]
+
+        starts = np.flatnonzero((data == FRAME_START) & (line_start | prev_end))
+        ends = np.flatnonzero(is_end)
+        if len(starts) == 0 or len(ends) == 0:
+            starts = ends = np.zeros(0, dtype=np.int64)
+        else:
+            match = np.searchsorted(ends, starts)
+            valid = match < len(ends)
+            starts, match = starts[valid], match[valid]
+            candidate_ends = ends[match]
+            next_starts = np.append(starts[1:], size)
+            line_of_start = np.searchsorted(self.line_offsets, starts, side='right') - 1
+            valid = ((candidate_ends < next_starts) & (candidate_ends < self.line_offsets[line_of_start + 1])
+                     & (candidate_ends - starts < MAX_FRAME_SIZE))
+            starts, ends = starts[valid], candidate_ends[valid]
+
+        # Linhas com bytes fora de quadros: nova separação, sequencial, apenas nelas
+        line_count = len(self.line_offsets) - 1
+        frame_line = np.searchsorted(self.line_offsets, starts, side='right') - 1
+        covered = np.bincount(frame_line, weights=ends - starts + 1, minlength=line_count)
+        noisy = np.flatnonzero(covered != np.diff(self.line_offsets))
+        if len(noisy):
+            keep = ~np.isin(frame_line, noisy)
+            spans = [span for line in noisy.tolist()
+                     for span in _frame_spans(data[self.line_offsets[line]:self.line_offsets[line + 1]].tobytes(),
+                                              int(self.line_offsets[line]))]
+            extra = np.array(spans, dtype=np.int64).reshape(-1, 2)
+            order = np.argsort(np.concatenate((starts[keep], extra[:, 0])), kind='stable')
+            starts = np.concatenate((starts[keep], extra[:, 0]))[order]
+            ends = np.concatenate((ends[keep], extra[:, 1]))[order]
+
+        self.frame_start = starts
+        self.frame_end = ends
+        self.frame_line = np.searchsorted(self.line_offsets, starts, side='right') - 1
+        self.frame_time_ns = self.line_time_ns[self.frame_line]
+        self.frame_file = self.line_file[self.frame_line]
+        self.frame_length = ends - starts + 1
+        self.frame_command = data[starts + 1]
+        self.malformed_bytes = int(size - self.frame_length.sum())
+
+    def command_counts(self):
+        """Retorna a quantidade de quadros por byte de comando.
+
+        Returns:
+            dict: Mapeia o byte de comando, em hexadecimal, para a quantidade de quadros.
+        """
+        counts = np.bincount(self.frame_command, minlength=256)
+        return {f"{command:02X}": int(counts[command]) for command in np.flatnonzero(counts)}
+
+    def error_frames(self):
+        """Retorna a máscara booleana dos quadros de erro (comando E1)."""
+        return self.frame_command == ERROR_COMMAND
+
+    def error_rate(self):
+        """Retorna a fração de quadros de erro entre todos os quadros válidos."""
+        total = len(self.frame_command)
+        return float(self.error_frames().sum() / total) if total else 0.0
+
+    def inter_arrival_stats(self):
+        """Calcula as estatísticas do intervalo entre linhas consecutivas de cada arquivo.
+
+        Quadros agrupados na mesma linha compartilham o instante; por isso o
+        intervalo é medido entre linhas, sem atravessar a fronteira entre arquivos.
+
+        Returns:
+            dict: Quantidade, média, desvio padrão, mínimo, p50, p99 e máximo, em segundos.
+        """
+        same_file = self.line_file[1:] == self.line_file[:-1]
+        intervals = np.diff(self.line_time_ns)[same_file] / 1e9
+        if len(intervals) == 0:
+            return {'count': 0}
+        p50, p99 = np.percentile(intervals, [50, 99])
+        return {
+            'count': int(len(intervals)),
+            'mean': float(intervals.mean()),
+            'std': float(intervals.std()),
+            'min': float(intervals.min()),
+            'p50': float(p50),
+            'p99': float(p99),
+            'max': float(intervals.max()),
+        }
+
+    def payload_histogram(self, command=None):
+        """Calcula o histograma dos bytes de payload dos quadros.
+
+        Args:
+            command (int): Considera apenas os quadros com esse byte de comando; todos se None.
+
+        Returns:
+            numpy.ndarray: Contagem de cada valor de byte (256 posições).
+        """
+        starts, ends = self.frame_start + PAYLOAD_OFFSET, self.frame_end
+        if command is not None:
+            selected = self.frame_command == command
+            starts, ends = starts[selected], ends[selected]
+        lengths = np.maximum(ends - starts, 0)
+        if lengths.sum() == 0:
+            return np.zeros(256, dtype=np.int64)
+        # Índices de todos os bytes de payload, sem laço em Python
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        indices = np.arange(lengths.sum()) + offsets
+        return np.bincount(self.data[indices], minlength=256)
+
+    def summary(self):
+        """Retorna um resumo da análise.
+
+        Returns:
+            dict: Arquivos, linhas, quadros, bytes malformados, quadros por comando,
+            quadros de erro, taxa de erro e estatísticas do intervalo entre chegadas.
+        """
+        return {
+            'files': len(self.filenames),
+            'lines': int(len(self.line_time_ns)),
+            'frames': int(len(self.frame_start)),
+            'malformed_bytes': self.malformed_bytes,
+            'commands': self.command_counts(),
+            'error_frames': int(self.error_frames().sum()),
+            'error_rate': self.error_rate(),
+            'inter_arrival': self.inter_arrival_stats(),
+        }
+
+if __name__ == "__main__":
+    import json
+    paths = []
+    for argument in sys.argv[1:] or [DEFAULT_ARCHIVE]:
+        if os.path.isdir(argument):
+            paths.extend(find_logs(argument))
+        else:
+            paths.append(argument)
+    start = time.perf_counter()
+    analytics = LogAnalytics.from_files(paths)
+    report = analytics.summary()
+    report['elapsed_s'] = round(time.perf_counter() - start, 3)
+    print(json.dumps(report, indent=2))
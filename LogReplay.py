@@ -0,0 +1,169 @@
+'''
+@file LogReplay.py
+@brief Módulo para reprodução temporizada dos arquivos de log em um pseudo-terminal.
+
+Este módulo fornece uma classe LogReplay que lê arquivos data_log*.txt sob
+demanda, uma linha por vez, e escreve os quadros de cada linha em um
+pseudo-terminal (ou em qualquer função de escrita, como Serial.write) com o
+intervalo original entre as linhas, N vezes mais rápido ou o mais rápido
+possível. Como o log não é carregado antecipadamente, a reprodução de um
+arquivo de vários gigabytes começa imediatamente. RealXBeeData e o
+XBeeDataViewer podem abrir o caminho do pseudo-terminal (LogReplay.port)
+como se fosse a porta do rádio.
+
+Uso: python LogReplay.py arquivo [arquivo ...] [--speed 10 | --fast] [--max-gap 5]
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import argparse
+import os
+import selectors
+import threading
+import time
+from CaptureLog import read_log
+from TransmitScheduler import sleep_until
+from XBeeEmulator import open_pty
+
+class LogReplay:
+    """Classe para reprodução temporizada de capturas gravadas em arquivos de log."""
+
+    def __init__(self, filenames, speed=1.0, max_gap=None):
+        """Inicializa uma nova instância de LogReplay.
+
+        Args:
+            filenames (list[str]): Os arquivos de log, reproduzidos em sequência.
+            speed (float): Fator de velocidade (1.0 mantém o intervalo original,
+                10.0 reproduz dez vezes mais rápido); 0 ou None escreve o mais
+                rápido possível, limitado apenas pelo leitor.
+            max_gap (float): Intervalo máximo entre duas linhas, em segundos do
+                log, para não esperar pelas pausas entre sessões. Sem limite se None.
+        """
+        self.filenames = list(filenames)
+        self.speed = speed
+        self.max_gap = max_gap
+        self.stop_flag = threading.Event()
+        self.thread = None
+        self.master = self.slave = self.port = None
+        self.lines_sent = 0
+        self.bytes_sent = 0
+        self.lateness_max = 0  # Maior atraso de uma escrita em relação ao seu prazo, em nanossegundos
+
+    def open(self):
+        """Abre o pseudo-terminal de saída e retorna o caminho do seu lado escravo."""
+        self.master, self.slave, self.port = open_pty()
+        os.set_blocking(self.master, False)
+        return self.port
+
+    def close(self):
+        """Interrompe a reprodução e fecha o pseudo-terminal."""
+        self.stop()
+        if self.master is not None:
+            os.close(self.master)
+            os.close(self.slave)
+            self.master = self.slave = None
+
+    def start(self):
+        """Inicia a reprodução no pseudo-terminal em uma thread."""
+        if self.master is None:
+            self.open()
+        self.stop_flag.clear()
+        self.thread = threading.Thread(target=self.replay, args=(self.write_pty,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Interrompe a reprodução e aguarda a sua thread."""
+        self.stop_flag.set()
+        if self.thread:
+            self.thread.join()
+
+    def lines(self):
+        """Percorre as linhas de todos os arquivos, sob demanda.
+
+        Yields:
+            tuple: (timestamp_ns, source, data) de cada linha.
+        """
+        for filename in self.filenames:
+            yield from read_log(filename)
+
+    def replay(self, write):
+        """Escreve os quadros de cada linha no seu prazo, até o fim dos logs ou até stop.
+
+        O prazo de cada linha é calculado a partir do início da reprodução e do
+        instante gravado no log, de modo que os atrasos de escrita não se
+        acumulam; linhas com o mesmo instante são escritas em seguida, sem espera.
+
+        Args:
+            write: Função que recebe os bytes de cada linha.
+
+        Returns:
+            bool: True se todos os logs foram reproduzidos.
+        """
+        start = time.monotonic_ns()
+        log_time = previous = None
+        for timestamp_ns, _, data in self.lines():
+            if self.stop_flag.is_set():
+                return False
+            if self.speed:
+                if log_time is None:
+                    log_time = 0
+                else:
+                    gap = max(0, timestamp_ns - previous)
+                    if self.max_gap is not None:
+                        gap = min(gap, int(self.max_gap * 1e9))
+                    log_time += gap
+                previous = timestamp_ns
+                deadline = start + int(log_time / self.speed)
+                if not sleep_until(deadline, self.stop_flag):
+                    return False
+                lateness = time.monotonic_ns() - deadline
+                if lateness > self.lateness_max:
+                    self.lateness_max = lateness
+            write(data)
+            self.lines_sent += 1
+            self.bytes_sent += len(data)
+        return True
+
+    def write_pty(self, data):
+        """Escreve no pseudo-terminal, aguardando o leitor quando o buffer está cheio.
+
+        Args:
+            data (bytes): Os bytes a escrever.
+        """
+        view = memoryview(data)
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.master, selectors.EVENT_WRITE)
+            while view and not self.stop_flag.is_set():
+                try:
+                    view = view[os.write(self.master, view):]
+                except BlockingIOError:
+                    selector.select(0.1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reprodução temporizada de logs em um pseudo-terminal")
+    parser.add_argument('filenames', nargs='+')
+    parser.add_argument('--speed', type=float, default=1.0, help="fator de velocidade (1 = tempo original)")
+    parser.add_argument('--fast', action='store_true', help="reproduz o mais rápido possível")
+    parser.add_argument('--max-gap', type=float, default=None, help="intervalo máximo entre linhas, em segundos")
+    parser.add_argument('--link', help="cria um link simbólico com este nome para o pseudo-terminal")
+    args = parser.parse_args()
+
+    replay = LogReplay(args.filenames, speed=0 if args.fast else args.speed, max_gap=args.max_gap)
+    replay.open()
+    if args.link:
+        if os.path.islink(args.link):
+            os.remove(args.link)
+        os.symlink(replay.port, args.link)
+    print(f"Reprodução em: {args.link or replay.port}")
+    input("Abra a porta no leitor e pressione Enter para iniciar...")
+    replay.start()
+    try:
+        replay.thread.join()
+        print(f"Linhas reproduzidas: {replay.lines_sent} ({replay.bytes_sent} bytes), "
+              f"atraso máximo: {replay.lateness_max / 1e6:.3f} ms")
+        input("Pressione Enter para fechar o pseudo-terminal...")
+    except KeyboardInterrupt:
+        pass
+    replay.close()
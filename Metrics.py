@@ -0,0 +1,241 @@
+'''
+@file Metrics.py
+@brief Módulo com o registro de métricas da captura (contadores, medidores e histogramas).
+
+Este módulo fornece uma classe MetricsRegistry com contadores, medidores e
+histogramas de faixas fixas, baratos o bastante para ficarem sempre ativos:
+cada métrica é atualizada por uma única thread, sem lock, e as métricas que já
+existem como atributos (quadros do FrameParser, profundidade do FrameRing,
+etc.) são lidas por uma função apenas quando consultadas. O registro pode ser
+lido pela barra de status da interface (summary), em formato texto do
+Prometheus por HTTP em localhost (serve) e em instantâneos JSON periódicos
+(start_snapshots).
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+from array import array
+from bisect import bisect_left
+import json
+import os
+import threading
+import time
+
+'''Definição de Constantes'''
+# Faixas padrão dos histogramas de tempo, em segundos (100 us a 10 s)
+TIME_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_PORT = 9464
+SNAPSHOT_INTERVAL = 10.0
+
+class Counter:
+    """Classe para um contador crescente, atualizado por uma única thread."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, function=None):
+        """Inicializa uma nova instância de Counter.
+
+        Args:
+            name (str): O nome da métrica, no formato do Prometheus.
+            help_text (str): A descrição da métrica.
+            function: Função sem argumentos que retorna o valor, para contadores
+                que já existem como atributos; nesse caso inc não é usado.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.function = function
+        self.count = 0
+
+    def inc(self, amount=1):
+        """Incrementa o contador."""
+        self.count += amount
+
+    @property
+    def value(self):
+        """O valor atual do contador."""
+        return self.function() if self.function else self.count
+
+class Gauge(Counter):
+    """Classe para um medidor, que pode subir e descer."""
+
+    kind = 'gauge'
+
+    def set(self, value):
+        """Define o valor do medidor."""
+        self.count = value
+
+class Histogram:
+    """Classe para um histograma com faixas fixas, atualizado por uma única thread."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=TIME_BUCKETS):
+        """Inicializa uma nova instância de Histogram.
+
+        Args:
+            name (str): O nome da métrica, no formato do Prometheus.
+            help_text (str): A descrição da métrica.
+            buckets (tuple): Os limites superiores das faixas, em ordem crescente.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.counts = array('Q', bytes(8 * (len(self.buckets) + 1)))  # Última faixa: acima do maior limite
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Registra uma observação."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, fraction):
+        """Estima um quantil pelo limite superior da faixa que o contém.
+
+        Returns:
+            float: A estimativa, ou None sem observações (inf acima do maior limite).
+        """
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+
+    @property
+    def value(self):
+        """Resumo do histograma: contagem, soma, p50 e p99.
+
+        Os quantis acima do maior limite são informados como o próprio limite,
+        com overflow True, pois inf não é um valor JSON válido.
+        """
+        p50, p99 = self.quantile(0.5), self.quantile(0.99)
+        overflow = p99 == float('inf')
+        if overflow:
+            p99 = self.buckets[-1]
+            if p50 == float('inf'):
+                p50 = self.buckets[-1]
+        return {'count': self.count, 'sum': self.sum, 'p50': p50, 'p99': p99, 'overflow': overflow}
+
+class MetricsRegistry:
+    """Classe para o registro das métricas de uma captura."""
+
+    def __init__(self, prefix='xbee_'):
+        """Inicializa uma nova instância de MetricsRegistry.
+
+        Args:
+            prefix (str): Prefixo dos nomes das métricas.
+        """
+        self.prefix = prefix
+        self.metrics = {}
+        self.server = None
+        self.snapshot_stop = threading.Event()
+
+    def register(self, metric):
+        """Registra uma métrica e a retorna."""
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, function=None):
+        """Cria e registra um contador (veja Counter)."""
+        return self.register(Counter(self.prefix + name, help_text, function))
+
+    def gauge(self, name, help_text, function=None):
+        """Cria e registra um medidor (veja Gauge)."""
+        return self.register(Gauge(self.prefix + name, help_text, function))
+
+    def histogram(self, name, help_text, buckets=TIME_BUCKETS):
+        """Cria e registra um histograma (veja Histogram)."""
+        return self.register(Histogram(self.prefix + name, help_text, buckets))
+
+    def snapshot(self):
+        """Retorna os valores atuais de todas as métricas.
+
+        Returns:
+            dict: Mapeia o nome de cada métrica (sem o prefixo) para o seu valor.
+        """
+        return {name[len(self.prefix):]: metric.value for name, metric in self.metrics.items()}
+
+    def prometheus_text(self):
+        """Retorna todas as métricas no formato de texto do Prometheus (versão 0.0.4)."""
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.help_text}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            if metric.kind == 'histogram':
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float('inf'),), metric.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum {metric.sum}")
+                lines.append(f"{name}_count {metric.count}")
+            else:
+                lines.append(f"{name} {metric.value}")
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=METRICS_PORT, host='127.0.0.1'):
+        """Publica as métricas por HTTP (GET /metrics no formato do Prometheus, GET /json em JSON).
+
+        O servidor roda em uma thread própria e escuta apenas em localhost por padrão.
+
+        Args:
+            port (int): A porta TCP; 0 escolhe uma porta livre.
+            host (str): O endereço de escuta.
+
+        Returns:
+            int: A porta em que o servidor está escutando.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Só quando as métricas são publicadas
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/json'):
+                    body, content_type = json.dumps(registry.snapshot()).encode(), 'application/json'
+                elif self.path.startswith('/metrics') or self.path == '/':
+                    body, content_type = registry.prometheus_text().encode(), 'text/plain; version=0.0.4'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Sem registro de cada requisição no terminal
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server.server_address[1]
+
+    def write_snapshot(self, filename):
+        """Grava um instantâneo JSON das métricas, substituindo o arquivo de forma atômica."""
+        temporary = f"{filename}.tmp"
+        with open(temporary, 'w') as file:
+            json.dump({'time': time.time(), 'metrics': self.snapshot()}, file)
+        os.replace(temporary, filename)
+
+    def start_snapshots(self, filename, interval=SNAPSHOT_INTERVAL):
+        """Grava um instantâneo JSON a cada interval segundos, em uma thread, até stop."""
+        def loop():
+            while not self.snapshot_stop.wait(interval):
+                self.write_snapshot(filename)
+        self.snapshot_stop.clear()
+        threading.Thread(target=loop, daemon=True).start()
+
+    def stop(self):
+        """Encerra o servidor HTTP e os instantâneos periódicos."""
+        self.snapshot_stop.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,99 @@
+'''
+@file MultiPortCapture.py
+@brief Módulo para captura simultânea de vários dispositivos XBee.
+
+Este módulo fornece uma classe MultiPortCapture que observa várias portas
+seriais com selectors (epoll no Linux) em uma única thread, lê apenas as portas
+que têm dados prontos e identifica cada quadro com a porta de origem. A classe
+tem a mesma interface de RealXBeeData e pode substituí-la no XBeeDataViewer.
+
+Os descritores das portas seriais só podem ser observados com selectors em
+sistemas POSIX (Linux, macOS).
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import os
+import selectors
+import time
+import serial
+from FrameParser import FrameParser
+from RealXBeeData import RealXBeeData, MAX_READ_SIZE, MAX_HISTORY
+
+'''Definição de Constantes'''
+SELECT_TIMEOUT = 0.1
+
+class MultiPortCapture(RealXBeeData):
+    """Classe para captura de várias portas seriais com uma única thread de leitura."""
+
+    def __init__(self, app, ports, baudrate, max_read_size=MAX_READ_SIZE, max_history=MAX_HISTORY):
+        """Inicializa uma nova instância de MultiPortCapture.
+
+        Args:
+            app: A aplicação que utiliza a classe MultiPortCapture.
+            ports (list[str]): As portas seriais observadas; o nome de cada porta
+                é usado como origem dos seus quadros.
+            baudrate (int): A taxa de baud dos dispositivos XBee.
+            max_read_size (int): Quantidade máxima de bytes lidos por chamada a cada porta.
+            max_history (int): Quantidade de quadros recentes mantidos em packets.
+        """
+        RealXBeeData.__init__(self, app, None, baudrate, max_read_size, max_history)
+        self.ports = list(ports)
+        self.sources = list(self.ports)
+        self.parsers = [FrameParser() for _ in self.ports]
+        self.serial_ports = []
+        self.port_errors = [0] * len(self.ports)
+
+    def receive_data(self):
+        """Recebe os dados de todas as portas e os processa em uma única thread.
+
+        A thread fica bloqueada em select até que alguma porta tenha dados; cada
+        porta pronta é lida com uma única chamada os.read e o bloco é separado em
+        quadros pelo FrameParser da porta. Uma porta que falha ou é desconectada
+        deixa de ser observada sem interromper as demais.
+        """
+        selector = selectors.DefaultSelector()
+        try:
+            self.running = True
+            for index, port in enumerate(self.ports):
+                # Uma porta ausente ou em uso não impede a captura nas demais
+                try:
+                    serial_port = serial.Serial(port, self.baudrate, timeout=0, exclusive=True)
+                except (OSError, ValueError, serial.SerialException) as e:
+                    print(f"Error opening {port}: {e}")
+                    self.port_errors[index] += 1
+                    continue
+                self.serial_ports.append(serial_port)
+                self.parsers[index].reset()
+                selector.register(serial_port.fileno(), selectors.EVENT_READ, index)
+            while not self.stop_flag.is_set() and selector.get_map():
+                events = selector.select(SELECT_TIMEOUT)
+                if not events:
+                    continue
+                # Um único par de leituras do relógio para todas as portas prontas
+                self.read_time_ns = time.time_ns()
+                self.read_monotonic_ns = time.monotonic_ns()
+                for key, _ in events:
+                    try:
+                        chunk = os.read(key.fd, self.max_read_size)
+                    except OSError as e:
+                        print(f"Error reading {self.ports[key.data]}: {e}")
+                        chunk = b''
+                    if not chunk:
+                        self.port_errors[key.data] += 1
+                        selector.unregister(key.fd)
+                        continue
+                    self.bytes_read.inc(len(chunk))
+                    self.read_source = key.data
+                    self.parsers[key.data].scan(chunk, self.push_frame)
+        except Exception as e:
+            print(f"Error in receive_data: {e}")
+        finally:
+            self.running = False
+            selector.close()
+            for serial_port in self.serial_ports:
+                if serial_port.is_open:
+                    serial_port.close()
+            self.serial_ports = []
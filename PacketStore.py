@@ -0,0 +1,232 @@
+'''
+@file PacketStore.py
+@brief Módulo com o armazenamento compacto, em colunas, dos quadros capturados.
+
+Este módulo fornece uma classe PacketStore que guarda os quadros recebidos em
+arrays tipados: instantes em nanossegundos (relógio de parede e monotônico),
+deslocamentos em um único buffer
+contíguo de bytes brutos, porta de origem, byte de comando e flags. A representação em
+hexadecimal só é gerada quando o quadro é exibido ou exportado.
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+from array import array
+import time
+
+'''Definição de Constantes'''
+ERROR_COMMAND = 0xE1
+FLAG_ERROR = 0x01
+
+class TimestampFormatter:
+    """Classe para formatação de instantes com cache do prefixo de cada segundo.
+
+    Quadros recebidos no mesmo segundo compartilham o prefixo 'AAAA-MM-DD HH:MM:SS',
+    de modo que time.strftime só é chamado uma vez por segundo.
+    """
+
+    def __init__(self, precision=3):
+        """Inicializa uma nova instância de TimestampFormatter.
+
+        Args:
+            precision (int): Quantidade de casas da fração de segundo (3 para
+                milissegundos, 6 para microssegundos).
+        """
+        self.precision = precision
+        self.divisor = 10 ** (9 - precision)
+        self.cache = (None, '')  # Par (segundo, prefixo) do último segundo formatado
+
+    def format(self, timestamp_ns):
+        """Formata um instante em nanossegundos como 'AAAA-MM-DD HH:MM:SS.mmm'.
+
+        Args:
+            timestamp_ns (int): Instante, em nanossegundos desde a época Unix.
+
+        Returns:
+            str: O instante formatado no horário local.
+        """
+        seconds, nanoseconds = divmod(timestamp_ns, 1000000000)
+        cached_seconds, prefix = self.cache
+        if seconds != cached_seconds:
+            prefix = time.strftime('%Y-%m-%d %H:%M:%S.', time.localtime(seconds))
+            self.cache = (seconds, prefix)
+        return f"{prefix}{nanoseconds // self.divisor:0{self.precision}d}"
+
+format_timestamp = TimestampFormatter().format
+
+class TimestampParser:
+    """Classe para leitura de instantes 'AAAA-MM-DD HH:MM:SS[.ffffff]' com cache do segundo.
+
+    Operação inversa de TimestampFormatter: linhas do mesmo segundo compartilham
+    o prefixo, de modo que a conversão de data só é feita uma vez por segundo.
+    """
+
+    def __init__(self):
+        """Inicializa uma nova instância de TimestampParser."""
+        self.cache = (None, 0)  # Par (prefixo, segundos) do último segundo lido
+
+    def parse(self, text):
+        """Converte um instante no horário local em nanossegundos desde a época Unix.
+
+        Args:
+            text (str): O instante, com ou sem fração de segundo (1 a 9 casas).
+
+        Returns:
+            int: O instante, em nanossegundos.
+        """
+        prefix, _, fraction = text.partition('.')
+        cached_prefix, seconds = self.cache
+        if prefix != cached_prefix:
+            seconds = int(time.mktime(time.strptime(prefix, '%Y-%m-%d %H:%M:%S')))
+            self.cache = (prefix, seconds)
+        return seconds * 1000000000 + (int(fraction.ljust(9, '0')) if fraction else 0)
+
+parse_timestamp = TimestampParser().parse
+
+class PacketStore:
+    """Classe para armazenamento dos quadros capturados em colunas tipadas."""
+
+    def __init__(self, max_frames=None):
+        """Inicializa uma nova instância de PacketStore.
+
+        Args:
+            max_frames (int): Quantidade máxima de quadros mantidos; ao atingi-la,
+                a metade mais antiga é descartada de uma só vez. Sem limite se None.
+        """
+        self.max_frames = max_frames
+        self.timestamps = array('q')
+        self.monotonic = array('q')
+        self.offsets = array('Q', [0])
+        self.sources = array('H')
+        self.commands = array('B')
+        self.flags = array('B')
+        self.raw = bytearray()
+        self.raw_base = 0  # Deslocamento absoluto do primeiro byte mantido em raw
+        self.first_index = 0  # Índice absoluto do quadro mais antigo mantido
+        self.error_count = 0  # Quadros de erro desde a criação, incluindo os descartados
+
+    def __len__(self):
+        """Retorna a quantidade de quadros mantidos em memória."""
+        return len(self.timestamps)
+
+    @property
+    def total_count(self):
+        """Quantidade de quadros armazenados desde a criação, incluindo os descartados."""
+        return self.first_index + len(self.timestamps)
+
+    def append(self, frame, timestamp_ns, monotonic_ns=0, source=0):
+        """Armazena um quadro.
+
+        Args:
+            frame (bytes): O quadro recebido, incluindo os delimitadores.
+            timestamp_ns (int): Instante de recebimento (time.time_ns), em nanossegundos.
+            monotonic_ns (int): Instante de recebimento (time.monotonic_ns), para
+                medir intervalos sem ser afetado por ajustes do relógio.
+            source (int): Índice da porta de origem do quadro.
+        """
+        if self.max_frames and len(self.timestamps) >= self.max_frames:
+            self.discard(len(self.timestamps) // 2)
+        command = frame[1] if len(frame) > 1 else 0
+        flags = FLAG_ERROR if command == ERROR_COMMAND else 0
+        self.raw += frame
+        self.timestamps.append(timestamp_ns)
+        self.monotonic.append(monotonic_ns)
+        self.offsets.append(self.raw_base + len(self.raw))
+        self.sources.append(source)
+        self.commands.append(command)
+        self.flags.append(flags)
+        if flags & FLAG_ERROR:
+            self.error_count += 1
+
+    def discard(self, count):
+        """Descarta os count quadros mais antigos.
+
+        Args:
+            count (int): Quantidade de quadros descartados.
+        """
+        cut = self.offsets[count] - self.raw_base
+        del self.raw[:cut]
+        del self.timestamps[:count]
+        del self.monotonic[:count]
+        del self.offsets[:count]
+        del self.sources[:count]
+        del self.commands[:count]
+        del self.flags[:count]
+        self.raw_base += cut
+        self.first_index += count
+
+    def clear(self):
+        """Descarta todos os quadros mantidos em memória."""
+        self.discard(len(self.timestamps))
+
+    def frame(self, index):
+        """Retorna os bytes de um quadro.
+
+        Args:
+            index (int): Índice absoluto do quadro.
+
+        Returns:
+            bytes: O quadro, incluindo os delimitadores.
+        """
+        position = index - self.first_index
+        start = self.offsets[position] - self.raw_base
+        end = self.offsets[position + 1] - self.raw_base
+        return bytes(self.raw[start:end])
+
+    def hex(self, index):
+        """Retorna um quadro em hexadecimal, no formato 'AB 81 10 ... CD'."""
+        return self.frame(index).hex(' ').upper()
+
+    def timestamp(self, index):
+        """Retorna o instante de recebimento de um quadro, em nanossegundos."""
+        return self.timestamps[index - self.first_index]
+
+    def source(self, index):
+        """Retorna o índice da porta de origem de um quadro."""
+        return self.sources[index - self.first_index]
+
+    def is_error(self, index):
+        """Indica se um quadro é um quadro de erro (comando E1)."""
+        return bool(self.flags[index - self.first_index] & FLAG_ERROR)
+
+    def payload_byte(self, index, offset):
+        """Retorna o byte de um quadro em uma posição, sem copiar o quadro.
+
+        Args:
+            index (int): Índice absoluto do quadro.
+            offset (int): Posição do byte no quadro (3 para o primeiro byte de payload).
+
+        Returns:
+            int: O byte, ou None se o quadro terminar antes dessa posição (o
+            delimitador final não conta).
+        """
+        position = index - self.first_index
+        start = self.offsets[position] - self.raw_base
+        if start + offset >= self.offsets[position + 1] - self.raw_base - 1:
+            return None
+        return self.raw[start + offset]
+
+    def count_command(self, command):
+        """Conta os quadros mantidos com um determinado byte de comando."""
+        return self.commands.count(command)
+
+    def to_numpy(self):
+        """Retorna cópias das colunas como arrays NumPy, para consultas vetorizadas.
+
+        Returns:
+            dict: Arrays 'timestamp_ns', 'monotonic_ns', 'offsets', 'source', 'command', 'flags' e 'raw'.
+            Os deslocamentos são relativos ao início de 'raw' e têm um elemento
+            a mais que os quadros.
+        """
+        import numpy as np
+        return {
+            'timestamp_ns': np.array(self.timestamps, dtype=np.int64),
+            'monotonic_ns': np.array(self.monotonic, dtype=np.int64),
+            'offsets': np.array(self.offsets, dtype=np.uint64) - np.uint64(self.raw_base),
+            'source': np.array(self.sources, dtype=np.uint16),
+            'command': np.array(self.commands, dtype=np.uint8),
+            'flags': np.array(self.flags, dtype=np.uint8),
+            'raw': np.frombuffer(bytes(self.raw), dtype=np.uint8),
+        }
@@ -0,0 +1,123 @@
+'''
+@file PacketTemplate.py
+@brief Módulo para modelos de pacote pré-compilados com campos dinâmicos.
+
+Este módulo fornece uma classe PacketTemplate que compila uma única vez um
+pacote hexadecimal com campos entre chaves em um buffer pré-alocado; a cada
+envio apenas os campos são atualizados no próprio buffer, sem reinterpretar o
+texto nem alocar um novo pacote.
+
+Campos disponíveis ({nome} ou {nome:tamanho_em_bytes}, big-endian):
+    {seq}   contador de sequência, incrementado a cada envio
+    {ts}    bytes menos significativos do instante atual, em milissegundos
+    {rand}  bytes aleatórios
+    {sum}   soma (módulo 256) dos bytes desde o segundo byte do pacote até o campo
+    {xor}   XOR dos bytes desde o segundo byte do pacote até o campo
+
+Os campos nunca contêm os delimitadores AB e CD, que encerrariam o quadro no
+FrameParser do receptor: {seq} pula os valores que os contêm (como o Monitor),
+{rand} sorteia novamente e, em {ts}, {sum} e {xor}, AB vira AA e CD vira CC.
+
+Exemplo: PacketTemplate("AB 81 10 {seq} {rand:2} {xor} CD")
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import random
+import re
+import struct
+import time
+
+'''Definição de Constantes'''
+FIELD_PATTERN = re.compile(r'\{(\w+)(?::(\d+))?\}')
+VALUE_FIELDS = ('seq', 'ts', 'rand')
+CHECKSUM_FIELDS = ('sum', 'xor')
+STRUCT_FORMATS = {1: '>B', 2: '>H', 4: '>I', 8: '>Q'}
+FRAME_START = 0xAB
+FRAME_END = 0xCD
+# Substituição dos delimitadores nos campos que não podem ser sorteados ou pulados (AB -> AA, CD -> CC)
+DELIMITER_REMAP = bytes(byte ^ 1 if byte in (FRAME_START, FRAME_END) else byte for byte in range(256))
+
+class PacketTemplate:
+    """Classe para pacotes compilados uma única vez e atualizados no lugar a cada envio."""
+
+    def __init__(self, text, seed=None):
+        """Compila um modelo de pacote.
+
+        Args:
+            text (str): O pacote em hexadecimal, com campos entre chaves.
+            seed: Semente do gerador dos campos {rand}, para tráfego reproduzível.
+
+        Raises:
+            ValueError: Se o texto tiver hexadecimal inválido ou um campo desconhecido.
+        """
+        self.text = text
+        self.buffer = bytearray()
+        self.value_fields = []
+        self.checksum_fields = []
+        self.sequence = 0
+        self.random = random.Random(seed)
+        pos = 0
+        for match in FIELD_PATTERN.finditer(text):
+            self.buffer += bytes.fromhex(text[pos:match.start()])
+            kind, size = match.group(1), int(match.group(2) or 1)
+            if kind in VALUE_FIELDS:
+                self.value_fields.append((kind, len(self.buffer), size))
+            elif kind in CHECKSUM_FIELDS:
+                if size != 1:
+                    raise ValueError(f"O campo {{{kind}}} tem 1 byte")
+                self.checksum_fields.append((kind, len(self.buffer)))
+            else:
+                raise ValueError(f"Campo desconhecido no pacote: {{{kind}}}")
+            self.buffer += bytes(size)
+            pos = match.end()
+        self.buffer += bytes.fromhex(text[pos:])
+        self.view = memoryview(self.buffer)
+
+    @property
+    def is_static(self):
+        """Indica se o pacote não tem campos dinâmicos."""
+        return not self.value_fields and not self.checksum_fields
+
+    def render(self):
+        """Atualiza os campos dinâmicos e retorna o pacote.
+
+        Returns:
+            bytearray: O buffer do pacote. É o mesmo objeto a cada chamada e só é
+            válido até a próxima; quem precisar guardá-lo deve copiá-lo.
+        """
+        buffer = self.buffer
+        for kind, offset, size in self.value_fields:
+            end = offset + size
+            while True:
+                if kind == 'seq':
+                    value = self.sequence
+                elif kind == 'ts':
+                    value = time.time_ns() // 1000000
+                else:
+                    value = self.random.getrandbits(8 * size)
+                value &= (1 << (8 * size)) - 1
+                if size in STRUCT_FORMATS:
+                    struct.pack_into(STRUCT_FORMATS[size], buffer, offset, value)
+                else:
+                    buffer[offset:end] = value.to_bytes(size, 'big')
+                if buffer.find(FRAME_START, offset, end) == -1 and buffer.find(FRAME_END, offset, end) == -1:
+                    break
+                if kind == 'seq':
+                    self.sequence += 1  # Pula os valores com um delimitador
+                elif kind == 'ts':
+                    buffer[offset:end] = buffer[offset:end].translate(DELIMITER_REMAP)
+                    break
+                # {rand}: sorteia novamente
+        for kind, offset in self.checksum_fields:
+            if kind == 'sum':
+                checksum = sum(self.view[1:offset]) & 0xFF
+            else:
+                checksum = 0
+                for byte in self.view[1:offset]:
+                    checksum ^= byte
+            buffer[offset] = DELIMITER_REMAP[checksum]
+        self.sequence += 1
+        return buffer
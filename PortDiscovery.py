@@ -0,0 +1,202 @@
+'''
+@file PortDiscovery.py
+@brief Módulo para descoberta da porta serial e da taxa de baud do rádio XBee.
+
+Este módulo sonda ao mesmo tempo, uma thread por porta, todas as portas
+candidatas (as listadas pelo pyserial, /dev/ttyUSB*, /dev/ttyACM* e os
+pseudo-terminais informados, como o do XBeeEmulator). Em cada porta as taxas
+de baud são tentadas em sequência, e cada uma recebe uma nota pelos quadros
+AB ... CD válidos que o FrameParser separa em uma janela curta, ponderada pela
+fração dos bytes lidos que pertencem a quadros (em uma taxa errada, os bytes
+chegam corrompidos e quase todos são descartados). A sondagem termina assim
+que uma porta é reconhecida com segurança, o que normalmente leva poucos
+décimos de segundo.
+
+O resultado é guardado por número de série do dispositivo, de modo que uma
+reconexão verifica primeiro apenas a porta e a taxa já conhecidas.
+
+Os pseudo-terminais em /dev/pts não são sondados automaticamente, pois em
+geral são terminais interativos; informe o seu caminho em extra_ports.
+
+Uso: python PortDiscovery.py [porta ...] [--baudrates 9600 115200] [--window 0.1] [--no-cache]
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import glob
+import json
+import os
+import threading
+import time
+import serial
+from serial.tools import list_ports
+from FrameParser import FrameParser
+
+'''Definição de Constantes'''
+# Taxas tentadas, da mais comum para a menos comum nos rádios XBee
+DEFAULT_BAUDRATES = (9600, 115200, 57600, 19200, 38400, 230400)
+PORT_PATTERNS = ('/dev/ttyUSB*', '/dev/ttyACM*')
+PROBE_WINDOW = 0.1  # Janela de leitura por taxa de baud, em segundos
+READ_TIMEOUT = 0.02
+# Uma taxa é aceita sem esperar o fim da janela com estes quadros e esta fração de bytes em quadros
+MIN_FRAMES = 3
+MIN_FRAMED_RATIO = 0.9
+# Abaixo desta fração os quadros são coincidências no ruído (cerca de 3% com bytes aleatórios)
+MIN_ACCEPTED_RATIO = 0.5
+CACHE_FILE = os.path.join(os.path.expanduser('~'), '.xbee_portas.json')
+
+def candidate_ports(extra_ports=()):
+    """Lista as portas candidatas.
+
+    Args:
+        extra_ports (list[str]): Portas adicionais, como pseudo-terminais.
+
+    Returns:
+        dict: Mapeia o caminho de cada porta para o número de série do
+        dispositivo USB (None se desconhecido).
+    """
+    candidates = {info.device: info.serial_number for info in list_ports.comports()}
+    for pattern in PORT_PATTERNS:
+        for device in glob.glob(pattern):
+            candidates.setdefault(device, None)
+    for device in extra_ports:
+        candidates.setdefault(device, None)
+    return candidates
+
+def load_cache(filename=CACHE_FILE):
+    """Lê o cache de dispositivos conhecidos (vazio se o arquivo não existir ou for inválido)."""
+    try:
+        with open(filename) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache, filename=CACHE_FILE):
+    """Grava o cache de dispositivos conhecidos, substituindo o arquivo de forma atômica."""
+    temporary = f"{filename}.tmp"
+    with open(temporary, 'w') as file:
+        json.dump(cache, file, indent=2)
+    os.replace(temporary, filename)
+
+def probe_port(port, baudrates=DEFAULT_BAUDRATES, window=PROBE_WINDOW, found=None):
+    """Sonda uma porta em cada taxa de baud e retorna a de maior nota.
+
+    Args:
+        port (str): A porta serial.
+        baudrates (list[int]): As taxas tentadas, em ordem.
+        window (float): Tempo máximo de leitura em cada taxa, em segundos.
+        found (threading.Event): Definido por esta ou outra sondagem quando uma
+            porta é reconhecida com segurança; interrompe as demais.
+
+    Returns:
+        dict: 'port', 'baudrate', 'frames', 'framed_ratio', 'score' e
+        'confident' da melhor taxa, ou None se a porta não pôde ser aberta ou
+        não apresentou quadros em nenhuma taxa (ou apenas em meio a ruído).
+    """
+    found = found or threading.Event()
+    best = None
+    try:
+        with serial.Serial(port, baudrates[0], timeout=READ_TIMEOUT, exclusive=True) as device:
+            for baudrate in baudrates:
+                if found.is_set():
+                    break
+                device.baudrate = baudrate
+                device.reset_input_buffer()
+                parser = FrameParser()
+                total = frames = 0
+                deadline = time.monotonic() + window
+                while time.monotonic() < deadline and not found.is_set():
+                    chunk = device.read(device.in_waiting or 1)
+                    total += len(chunk)
+                    frames += parser.scan(chunk, lambda frame: None)
+                    if frames >= MIN_FRAMES and (total - parser.discarded_bytes) / total >= MIN_FRAMED_RATIO:
+                        break
+                ratio = (total - parser.discarded_bytes) / total if total else 0.0
+                if not frames or ratio < MIN_ACCEPTED_RATIO:
+                    continue
+                confident = frames >= MIN_FRAMES and ratio >= MIN_FRAMED_RATIO
+                result = {'port': port, 'baudrate': baudrate, 'frames': frames, 'framed_ratio': ratio,
+                          'score': frames * ratio, 'confident': confident}
+                if best is None or result['score'] > best['score']:
+                    best = result
+                if confident:
+                    found.set()
+                    break
+    except (OSError, ValueError, serial.SerialException):
+        return None  # Porta inexistente, em uso por outro processo ou sem permissão
+    return best
+
+def probe_all(targets, window=PROBE_WINDOW):
+    """Sonda várias portas ao mesmo tempo, uma thread por porta.
+
+    Args:
+        targets (dict): Mapeia cada porta para as taxas de baud tentadas nela.
+        window (float): Tempo máximo de leitura em cada taxa, em segundos.
+
+    Returns:
+        dict: O resultado de maior nota (veja probe_port), ou None.
+    """
+    if not targets:
+        return None
+    found = threading.Event()
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        results = list(executor.map(lambda port: probe_port(port, targets[port], window, found), targets))
+    results = [result for result in results if result]
+    # Resultados seguros vêm antes dos demais, mesmo com nota menor
+    return max(results, key=lambda result: (result['confident'], result['score']), default=None)
+
+def discover(extra_ports=(), baudrates=DEFAULT_BAUDRATES, window=PROBE_WINDOW, cache_file=CACHE_FILE):
+    """Descobre a porta e a taxa de baud do rádio XBee.
+
+    Os dispositivos cujo número de série está no cache são verificados
+    primeiro, apenas na taxa já conhecida; se nenhum deles responder, todas as
+    portas candidatas são sondadas em todas as taxas.
+
+    Args:
+        extra_ports (list[str]): Portas adicionais, como pseudo-terminais.
+        baudrates (list[int]): As taxas tentadas, em ordem.
+        window (float): Tempo máximo de leitura em cada taxa, em segundos.
+        cache_file (str): O arquivo do cache por número de série; sem cache se None.
+
+    Returns:
+        dict: O resultado (veja probe_port), com 'serial_number' e 'cached', ou
+        None se nenhuma porta apresentou quadros.
+    """
+    candidates = candidate_ports(extra_ports)
+    cache = load_cache(cache_file) if cache_file else {}
+    known = {port: (cache[serial_number]['baudrate'],) for port, serial_number in candidates.items()
+             if serial_number in cache}
+    result = probe_all(known, window)
+    cached = result is not None
+    if not cached:
+        result = probe_all({port: baudrates for port in candidates}, window)
+    if result is None:
+        return None
+    result['serial_number'] = candidates.get(result['port'])
+    result['cached'] = cached
+    if cache_file and result['serial_number'] and not cached:
+        cache[result['serial_number']] = {'baudrate': result['baudrate'], 'port': result['port']}
+        save_cache(cache, cache_file)
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Descoberta da porta serial e da taxa de baud do XBee")
+    parser.add_argument('extra_ports', nargs='*', help="portas adicionais, como pseudo-terminais")
+    parser.add_argument('--baudrates', type=int, nargs='+', default=list(DEFAULT_BAUDRATES))
+    parser.add_argument('--window', type=float, default=PROBE_WINDOW, help="segundos de leitura por taxa de baud")
+    parser.add_argument('--no-cache', action='store_true', help="não lê nem grava o cache por número de série")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = discover(args.extra_ports, args.baudrates, args.window, None if args.no_cache else CACHE_FILE)
+    elapsed = time.perf_counter() - start
+    if result is None:
+        print(f"Nenhum XBee encontrado ({elapsed * 1000:.0f} ms)")
+    else:
+        print(f"{result['port']} a {result['baudrate']} baud: {result['frames']} quadros, "
+              f"{result['framed_ratio']:.0%} dos bytes em quadros"
+              f"{' (cache)' if result['cached'] else ''} ({elapsed * 1000:.0f} ms)")
@@ -0,0 +1,99 @@
+'''
+@file Profiler.py
+@brief Módulo para instrumentação opcional, por amostragem, das etapas da captura e do envio.
+
+Este módulo fornece uma classe StageProfiler que mede com time.perf_counter_ns
+a duração de cada etapa (leitura da porta, separação dos quadros, formatação,
+gravação em disco, atualização do Tk, escrita no envio) em 1 de cada N
+iterações, de modo que o custo fica limitado mesmo em taxas altas. Cada etapa
+é identificada por uma pilha 'laço;etapa'. O resultado pode ser gravado em
+JSON ou no formato de pilhas colapsadas, aceito pelo flamegraph.pl e pelo
+speedscope.
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import json
+import time
+
+'''Definição de Constantes'''
+SAMPLE_EVERY = 100
+
+class StageProfiler:
+    """Classe para a medição por amostragem da duração das etapas de um laço."""
+
+    def __init__(self, sample_every=SAMPLE_EVERY):
+        """Inicializa uma nova instância de StageProfiler.
+
+        Args:
+            sample_every (int): Mede 1 de cada sample_every iterações de cada laço.
+        """
+        self.sample_every = sample_every
+        self.calls = {}  # Laço -> iterações desde o início
+        self.stages = {}  # Pilha 'laço;etapa' -> [amostras, itens, total_ns, máximo_ns]
+        self.started = time.time()
+
+    def sample(self, loop):
+        """Indica se a iteração atual de um laço deve ser medida.
+
+        Cada laço deve ser executado por uma única thread; laços diferentes
+        podem ser executados por threads diferentes.
+
+        Args:
+            loop (str): O nome do laço (por exemplo, 'receive_data').
+
+        Returns:
+            bool: True em 1 de cada sample_every chamadas.
+        """
+        calls = self.calls.get(loop, 0) + 1
+        self.calls[loop] = calls
+        return calls % self.sample_every == 0
+
+    def record(self, stack, elapsed_ns, items=1):
+        """Registra a duração de uma etapa em uma iteração amostrada.
+
+        Args:
+            stack (str): A pilha da etapa, no formato 'laço;etapa'.
+            elapsed_ns (int): A duração, em nanossegundos.
+            items (int): Quantidade de quadros (ou bytes) processados na etapa.
+        """
+        entry = self.stages.get(stack)
+        if entry is None:
+            entry = self.stages[stack] = [0, 0, 0, 0]
+        entry[0] += 1
+        entry[1] += items
+        entry[2] += elapsed_ns
+        if elapsed_ns > entry[3]:
+            entry[3] = elapsed_ns
+
+    def summary(self):
+        """Retorna o detalhamento por etapa.
+
+        Returns:
+            dict: Mapeia cada pilha para as amostras, os itens, o tempo total
+            amostrado, o tempo médio por amostra e por item e o tempo máximo, em
+            nanossegundos.
+        """
+        return {stack: {'samples': samples, 'items': items, 'total_ns': total, 'mean_ns': total / samples,
+                        'ns_per_item': total / items if items else None, 'max_ns': maximum}
+                for stack, (samples, items, total, maximum) in list(self.stages.items())}
+
+    def collapsed(self):
+        """Retorna as etapas no formato de pilhas colapsadas ('laço;etapa tempo_ns' por linha)."""
+        return ''.join(f"{stack} {entry[2]}\n" for stack, entry in sorted(self.stages.items()))
+
+    def dump(self, filename):
+        """Grava o detalhamento em JSON (.json) ou em pilhas colapsadas (qualquer outra extensão).
+
+        Returns:
+            str: O nome do arquivo gravado.
+        """
+        with open(filename, 'w') as file:
+            if filename.endswith('.json'):
+                json.dump({'sample_every': self.sample_every, 'started': self.started,
+                           'iterations': dict(self.calls), 'stages': self.summary()}, file, indent=2)
+            else:
+                file.write(self.collapsed())
+        return filename
@@ -15,18 +15,38 @@ from datetime import datetime
 import threading
 import time
 import serial
-import os
+from FrameParser import FrameParser
+from FrameRing import FrameRing
+from CaptureLog import RotatingCaptureLog
+from PacketStore import PacketStore, format_timestamp
+from Metrics import MetricsRegistry
+from Profiler import StageProfiler, SAMPLE_EVERY
+
+# Tamanho máximo de um bloco lido em uma única chamada à porta serial
+MAX_READ_SIZE = 4096
+
+# Quantidade de quadros recentes mantidos em memória para exibição
+MAX_HISTORY = 1000000
+
+# Nome exibido como origem dos quadros da porta única
+SOURCE_NAME = 'XBEE3'
+
+# Intervalo máximo, em segundos, entre duas verificações do stop_flag na leitura assíncrona
+STOP_POLL_INTERVAL = 0.1
 
 class RealXBeeData:
     """Classe para comunicação com um dispositivo XBee real."""
 
-    def __init__(self, app, port, baudrate):
+    def __init__(self, app, port, baudrate, max_read_size=MAX_READ_SIZE, max_history=MAX_HISTORY):
         """Inicializa uma nova instância de RealXBeeData.
 
         Args:
             app: A aplicação que utiliza a classe RealXBeeData.
             port (str): A porta serial à qual o dispositivo XBee está conectado.
             baudrate (int): A taxa de baud do dispositivo XBee.
+            max_read_size (int): Quantidade máxima de bytes lidos por chamada à porta serial.
+            max_history (int): Quantidade de quadros recentes mantidos em packets;
+                a captura completa fica no arquivo de log.
         """
         self.app = app
         self.data_counter = 0
@@ -35,13 +55,71 @@ class RealXBeeData:
         self.stop_flag = threading.Event()
         self.port = port
         self.baudrate = baudrate
-        self.buffer = bytearray()
-        self.received_data = []
+        self.parser = FrameParser()
+        self.parsers = [self.parser]  # Todos os separadores de quadros, para as métricas
+        self.frames = FrameRing()
+        self.packets = PacketStore(max_frames=max_history)
         self.receive_thread = None
-        self.buffer_lock = threading.Lock()
+        self.max_read_size = max_read_size
+        self.capture_log = None
+        self.sources = [SOURCE_NAME]  # Nome de cada origem, pelo índice gravado nos quadros
+        self.read_time_ns = 0
+        self.read_monotonic_ns = 0
+        self.read_source = 0
+        self.read_waited = False  # Se a última leitura precisou aguardar o primeiro byte
+        self.profiler = None
+        self.metrics = MetricsRegistry()
+        self.register_metrics()
+
+    def register_metrics(self):
+        """Registra as métricas da captura.
+
+        Só bytes_read, dispatch_lag e disk_write são atualizadas a cada leitura
+        ou lote; as demais leem, quando consultadas, os contadores que o
+        FrameParser, o FrameRing e o PacketStore já mantêm.
+        """
+        metrics = self.metrics
+        self.bytes_read = metrics.counter('bytes_read_total', "Bytes lidos das portas seriais")
+        metrics.counter('frames_total', "Quadros AB ... CD separados",
+                        lambda: self.frames.head + self.frames.overflow_count)
+        metrics.counter('error_frames_total', "Quadros de erro (comando E1)", lambda: self.packets.error_count)
+        metrics.counter('resyncs_total', "Ressincronizações do separador de quadros",
+                        lambda: sum(parser.resync_count for parser in self.parsers))
+        metrics.counter('discarded_bytes_total', "Bytes descartados fora de quadros",
+                        lambda: sum(parser.discarded_bytes for parser in self.parsers))
+        metrics.counter('ring_overflows_total', "Quadros descartados com o buffer circular cheio",
+                        lambda: self.frames.overflow_count)
+        metrics.gauge('queue_depth', "Quadros aguardando consumo no buffer circular", lambda: len(self.frames))
+        metrics.gauge('queue_high_water_mark', "Maior ocupação do buffer circular", lambda: self.frames.high_water_mark)
+        self.dispatch_lag = metrics.histogram('dispatch_lag_seconds',
+                                              "Atraso entre a leitura do quadro mais antigo de um lote e o seu consumo")
+        self.disk_write = metrics.histogram('disk_write_seconds', "Duração da gravação de um lote no log")
+
+    def enable_profiling(self, sample_every=SAMPLE_EVERY):
+        """Ativa a medição por amostragem das etapas de receive_data e drain_frames.
+
+        Args:
+            sample_every (int): Mede 1 de cada sample_every leituras e lotes.
+
+        Returns:
+            StageProfiler: O medidor, cujo detalhamento pode ser gravado com dump.
+        """
+        self.profiler = StageProfiler(sample_every)
+        return self.profiler
+
+    def start_real_communication(self, capture_log=True):
+        """Inicia a comunicação com o dispositivo XBee e o arquivo de log da sessão.
 
-    def start_real_communication(self):
-        """Inicia a comunicação com o dispositivo XBee."""
+        Não faz nada se a thread de leitura ainda estiver ativa, pois uma segunda
+        thread disputaria a mesma porta e o mesmo buffer circular.
+
+        Args:
+            capture_log (bool): Se False, a captura não é gravada em log.
+        """
+        if self.receive_thread and self.receive_thread.is_alive():
+            return
+        if capture_log and self.capture_log is None:
+            self.capture_log = RotatingCaptureLog()
         self.stop_flag.clear()
         self.receive_thread = threading.Thread(target=self.receive_data)
         self.receive_thread.start()
@@ -56,26 +134,34 @@ class RealXBeeData:
             self.receive_thread.join()
 
     def receive_data(self):
-        """Recebe os dados do dispositivo XBee e os processa."""
+        """Recebe os dados do dispositivo XBee e os processa.
+
+        Cada quadro AB ... CD é enviado ao buffer circular assim que o seu byte
+        final é lido; o timeout da porta serve apenas para verificar
+        periodicamente o stop_flag.
+        """
         try:
             self.running = True
-            self.serial_port = serial.Serial(self.port, self.baudrate, timeout=0.1)
+            self.parser.reset()
+            self.serial_port = serial.Serial(self.port, self.baudrate, timeout=0.1, exclusive=True)
             while not self.stop_flag.is_set():
-                byte = self.serial_port.read(1)
-                if byte:
-                    with self.buffer_lock:
-                        self.buffer.append(byte[0])
-                else:
-                    with self.buffer_lock:
-                        if len(self.buffer) > 0:
-                            timestamp = time.strftime('%Y-%m-%d %H:%M:%S.') + str(int(time.time() * 1000) % 1000).zfill(3)
-                            data_hex = ' '.join(f'{b:02X}' for b in self.buffer)
-                            self.app.update_serial_monitor(f"{timestamp}, Data: {data_hex}\n")
-                            real_data = {'source': 'XBEE3', 'data': data_hex, 'timestamp': timestamp}
-                            self.app.update_data_tree(real_data)
-                            self.received_data.append((timestamp, data_hex))
-                            self.buffer = bytearray()
-                            self.data_counter += 1  # Incrementa o contador de dados
+                sampled = self.profiler is not None and self.profiler.sample('receive_data')
+                if sampled:
+                    start = time.perf_counter_ns()
+                chunk = self.read_chunk()
+                if chunk:
+                    self.bytes_read.inc(len(chunk))
+                    # Um único par de leituras do relógio para todos os quadros do bloco
+                    self.read_time_ns = time.time_ns()
+                    self.read_monotonic_ns = time.monotonic_ns()
+                    if sampled:
+                        read_end = time.perf_counter_ns()
+                    count = self.parser.scan(chunk, self.push_frame)
+                    if sampled:
+                        # Leituras que aguardaram o primeiro byte medem a espera, não o custo da leitura
+                        stage = 'receive_data;wait' if self.read_waited else 'receive_data;read'
+                        self.profiler.record(stage, read_end - start, count)
+                        self.profiler.record('receive_data;frame', time.perf_counter_ns() - read_end, count)
         except Exception as e:
             print(f"Error in receive_data: {e}")
         finally:
@@ -83,44 +169,124 @@ class RealXBeeData:
             if self.serial_port and self.serial_port.is_open:
                 self.serial_port.close()
 
+    async def receive_data_async(self):
+        """Recebe os dados do dispositivo XBee no laço de eventos do asyncio.
+
+        Alternativa a receive_data, sem thread de leitura, para processos que
+        atendem várias portas em um único laço de eventos. Os quadros seguem
+        para o mesmo buffer circular e são consumidos por drain_frames. Termina
+        em até STOP_POLL_INTERVAL segundos após o stop_flag ser definido, quando
+        o dispositivo é desconectado ou quando a tarefa é cancelada.
+        """
+        # Importados aqui para que os processos que não usam o asyncio não paguem pela sua importação
+        import asyncio
+        from AsyncSerial import AsyncSerialTransport
+        try:
+            self.running = True
+            async with AsyncSerialTransport(self.port, self.baudrate) as transport:
+                while not self.stop_flag.is_set():
+                    try:
+                        frame, timestamp_ns, monotonic_ns = await asyncio.wait_for(transport.read_frame(),
+                                                                                    STOP_POLL_INTERVAL)
+                    except asyncio.TimeoutError:
+                        continue
+                    self.frames.push(frame, timestamp_ns, monotonic_ns, self.read_source)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error in receive_data_async: {e}")
+        finally:
+            self.running = False
+
+    def push_frame(self, frame):
+        """Copia um quadro completo para o buffer circular de quadros.
+
+        O quadro recebe o instante em que o bloco que o completou foi lido; a
+        formatação do instante fica para a exibição e a exportação.
+
+        Args:
+            frame: O quadro recebido, incluindo os delimitadores.
+        """
+        self.frames.push(frame, self.read_time_ns, self.read_monotonic_ns, self.read_source)
+
+    def drain_frames(self, max_items=None):
+        """Retira um lote de quadros do buffer circular e processa cada um deles.
+
+        Deve ser chamado sempre pela mesma thread consumidora (na interface, a
+        thread principal do Tk); a thread de leitura nunca acessa a aplicação.
+
+        Args:
+            max_items (int): Quantidade máxima de quadros processados; todos se None.
+
+        Returns:
+            list[dict]: Os dados processados, do mais antigo para o mais novo.
+        """
+        sampled = self.profiler is not None and self.profiler.sample('drain_frames')
+        if sampled:
+            start = time.perf_counter_ns()
+        items = self.frames.drain(max_items)
+        if items:
+            self.dispatch_lag.observe((time.monotonic_ns() - items[0][2]) / 1e9)
+        if sampled:
+            drained = time.perf_counter_ns()
+        batch = [self.process_frame(*item) for item in items]
+        if sampled:
+            formatted = time.perf_counter_ns()
+        if self.capture_log:
+            write_start = time.perf_counter()
+            self.capture_log.write_frames(batch)
+            self.disk_write.observe(time.perf_counter() - write_start)
+        if sampled:
+            profiler = self.profiler
+            profiler.record('drain_frames;ring', drained - start, len(batch))
+            profiler.record('drain_frames;format', formatted - drained, len(batch))
+            profiler.record('drain_frames;disk', time.perf_counter_ns() - formatted, len(batch))
+        return batch
+
+    def process_frame(self, frame, timestamp_ns, monotonic_ns=0, source=0):
+        """Armazena um quadro completo e gera a sua representação para exibição.
+
+        Args:
+            frame (bytes): O quadro recebido, incluindo os delimitadores.
+            timestamp_ns (int): O instante de recebimento do quadro (time.time_ns).
+            monotonic_ns (int): O instante de recebimento do quadro (time.monotonic_ns).
+            source (int): O índice da origem do quadro em sources.
+
+        Returns:
+            dict: Os dados do quadro com as chaves 'source', 'data' e 'timestamp'.
+        """
+        self.packets.append(frame, timestamp_ns, monotonic_ns, source)
+        self.data_counter += 1  # Incrementa o contador de dados
+        return {'source': self.sources[source], 'data': frame.hex(' ').upper(), 'timestamp': format_timestamp(timestamp_ns)}
+
+    def read_chunk(self):
+        """Lê de uma só vez todos os bytes disponíveis na porta serial.
+
+        Quando não há bytes pendentes, aguarda por no máximo o timeout da porta
+        o primeiro byte, de modo que o laço de leitura não fique em espera ativa.
+
+        Returns:
+            bytes: O bloco lido (vazio se o timeout expirou sem dados).
+        """
+        pending = self.serial_port.in_waiting
+        self.read_waited = not pending
+        return self.serial_port.read(min(pending, self.max_read_size) if pending else 1)
+
     def download_data(self):
-        """Baixa os dados recebidos do dispositivo XBee e os salva em um arquivo de texto."""
-        filename_base = 'data_log'
-        extension = 'txt'
-
-        i = 1
-        while True:
-            filename = f"{filename_base}{i}.{extension}"
-            if not os.path.exists(filename):
-                break
-            i += 1
-
-        # Inicializa contadores
-        quantidade_silabas_e1 = 0
-        numero_linhas = 1
-
-        with open(filename, 'w+') as file:
-            # Preenche o arquivo e conta as sílabas "E1" e o número de linhas
-            for timestamp, data_hex in self.received_data:
-                file.write(f"{timestamp} - XBEE3: {data_hex}\n")
-                quantidade_silabas_e1 += data_hex.upper().count("E1")
-                numero_linhas += 1
-
-            # Obtém o conteúdo atual do arquivo
-            file.seek(0)
-            existing_content = file.read()
-
-            # Reinicia o cursor para o início e escreve o relatório
-            file.seek(0)
-            file.write(f"{'-'*50}\n")
-            file.write(f"{'-'*50}\n")
-            file.write(f"Quantidade de Erros de Pacote: {quantidade_silabas_e1}\n")
-            file.write(f"Quantidade de Linhas: {numero_linhas}\n")
-            file.write(f"Porcentagem de erro: {(quantidade_silabas_e1/numero_linhas)*100}%\n")
-            file.write(f"{'-'*50}\n")
-            file.write(f"{'-'*50}\n")
-
-            # Adiciona de volta o conteúdo anterior
-            file.write(existing_content)
-
-        print(f"Dados baixados e salvos em: {filename}")
\ No newline at end of file
+        """Descarrega o log da sessão para o disco e grava o relatório de erros.
+
+        Os dados já são gravados continuamente durante a captura; aqui apenas o
+        buffer é descarregado e o resumo é gravado em um arquivo separado.
+        """
+        if self.capture_log is None:
+            print("Nenhum dado capturado.")
+            return
+        self.capture_log.flush()
+        summary_filename = self.capture_log.write_summary()
+        print(f"Dados baixados e salvos em: {', '.join(self.capture_log.segments)} (resumo em {summary_filename})")
+
+    def close_log(self):
+        """Fecha o arquivo de log da sessão."""
+        if self.capture_log:
+            self.capture_log.close()
+            self.capture_log = None
@@ -0,0 +1,197 @@
+'''
+@file TimeSeries.py
+@brief Módulo com a agregação contínua dos quadros em séries temporais de custo constante.
+
+Este módulo fornece uma classe RollingSeries, que agrega os quadros em faixas
+de tempo (quadros, quadros de erro e soma dos valores do payload por faixa)
+com memória limitada a capacity faixas, e a função lttb, que reduz uma série
+a poucas centenas de pontos preservando a sua forma (Largest-Triangle-Three-
+Buckets, Steinarsson 2013). Juntas, mantêm fixo o custo de desenhar os
+gráficos, seja a sessão de 10 minutos ou de 10 dias:
+
+    - com window=None, a série cobre a sessão inteira; ao faltar espaço, as
+      faixas vizinhas são somadas duas a duas e a largura da faixa dobra;
+    - com window em segundos, a largura é fixa e as faixas mais antigas que a
+      janela são descartadas.
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import time
+
+'''Definição de Constantes'''
+MAX_BINS = 2048
+BIN_WIDTH = 1.0  # Largura inicial de cada faixa, em segundos
+MAX_POINTS = 300  # Pontos desenhados por gráfico
+
+def lttb(xs, ys, threshold=MAX_POINTS):
+    """Reduz uma série a threshold pontos pelo algoritmo Largest-Triangle-Three-Buckets.
+
+    O primeiro e o último pontos são mantidos; de cada grupo intermediário é
+    escolhido o ponto que forma o maior triângulo com o ponto escolhido no
+    grupo anterior e com a média do grupo seguinte, o que preserva picos e
+    vales que uma média apagaria.
+
+    Args:
+        xs (list[float]): As abscissas, em ordem crescente.
+        ys (list[float]): As ordenadas.
+        threshold (int): Quantidade de pontos do resultado (no mínimo 3).
+
+    Returns:
+        tuple: (xs, ys) reduzidos; a própria série se já tiver até threshold pontos.
+    """
+    size = len(xs)
+    if threshold >= size or threshold < 3:
+        return list(xs), list(ys)
+    out_x, out_y = [xs[0]], [ys[0]]
+    every = (size - 2) / (threshold - 2)
+    selected = 0
+    for bucket in range(threshold - 2):
+        # Média do grupo seguinte (o último ponto, no caso do último grupo)
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, size)
+        if next_start >= next_end:
+            next_start, next_end = size - 1, size
+        count = next_end - next_start
+        mean_x = sum(xs[next_start:next_end]) / count
+        mean_y = sum(ys[next_start:next_end]) / count
+        # Ponto do grupo atual com o maior triângulo
+        ax, ay = xs[selected], ys[selected]
+        best_area = -1.0
+        for index in range(int(bucket * every) + 1, int((bucket + 1) * every) + 1):
+            area = abs((ax - mean_x) * (ys[index] - ay) - (ax - xs[index]) * (mean_y - ay))
+            if area > best_area:
+                best_area, selected = area, index
+        out_x.append(xs[selected])
+        out_y.append(ys[selected])
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
+
+class RollingSeries:
+    """Classe para agregação dos quadros em faixas de tempo, com memória limitada."""
+
+    def __init__(self, capacity=MAX_BINS, bin_width=BIN_WIDTH, window=None):
+        """Inicializa uma nova instância de RollingSeries.
+
+        Args:
+            capacity (int): Quantidade máxima de faixas (com window, é calculada
+                a partir da janela e de bin_width).
+            bin_width (float): Largura inicial de cada faixa, em segundos.
+            window (float): Duração da janela mais recente mantida, em segundos;
+                a sessão inteira se None.
+        """
+        self.window = window
+        self.bin_width = bin_width
+        self.capacity = max(1, int(window / bin_width)) if window else capacity
+        self.origin = None  # Início da primeira faixa, em segundos desde a época Unix
+        self.frames = []
+        self.errors = []
+        self.value_sum = []
+        self.value_count = []
+
+    def clear(self):
+        """Descarta todas as faixas."""
+        self.origin = None
+        self.frames, self.errors, self.value_sum, self.value_count = [], [], [], []
+
+    def bin(self, timestamp):
+        """Retorna o índice da faixa de um instante, criando as faixas que faltam.
+
+        Args:
+            timestamp (float): O instante, em segundos desde a época Unix.
+
+        Returns:
+            int: O índice da faixa em frames, errors, value_sum e value_count.
+        """
+        if self.origin is None:
+            # Faixas alinhadas a múltiplos da largura, para que grupos somados à parte caiam em uma única faixa
+            self.origin = timestamp - timestamp % self.bin_width
+        index = max(0, int((timestamp - self.origin) / self.bin_width))
+        if index < len(self.frames):
+            return index
+        if index >= self.capacity:
+            if self.window:
+                # Janela deslizante: descarta as faixas que saíram da janela
+                drop = index - self.capacity + 1
+                for column in (self.frames, self.errors, self.value_sum, self.value_count):
+                    del column[:drop]
+                self.origin += drop * self.bin_width
+                index -= drop
+            else:
+                while index >= self.capacity:
+                    self.merge()
+                    index //= 2
+        missing = index + 1 - len(self.frames)
+        if missing > 0:
+            self.frames.extend([0] * missing)
+            self.errors.extend([0] * missing)
+            self.value_sum.extend([0] * missing)
+            self.value_count.extend([0] * missing)
+        return index
+
+    def merge(self):
+        """Soma as faixas vizinhas duas a duas e dobra a largura da faixa."""
+        for name in ('frames', 'errors', 'value_sum', 'value_count'):
+            column = getattr(self, name)
+            setattr(self, name, [sum(column[index:index + 2]) for index in range(0, len(column), 2)])
+        self.bin_width *= 2
+
+    def add(self, timestamp, frames=1, errors=0, value_sum=0, value_count=0):
+        """Registra um quadro, ou um grupo de quadros da mesma faixa já somados.
+
+        Args:
+            timestamp (float): O instante dos quadros, em segundos desde a época Unix.
+            frames (int): Quantidade de quadros.
+            errors (int): Quantidade de quadros de erro.
+            value_sum (int): Soma dos valores do payload dos quadros.
+            value_count (int): Quantidade de valores somados em value_sum.
+        """
+        index = self.bin(timestamp)
+        self.frames[index] += frames
+        self.errors[index] += errors
+        self.value_sum[index] += value_sum
+        self.value_count[index] += value_count
+
+    def series(self, kind, now=None):
+        """Retorna uma das séries derivadas das faixas.
+
+        Args:
+            kind (str): 'rate' (quadros/s), 'error_ratio' (fração de quadros de
+                erro) ou 'value' (média dos valores do payload). As faixas sem
+                quadros ficam de fora das duas últimas.
+            now (float): O instante atual, para estender a série até ele e
+                calcular a taxa da última faixa, ainda incompleta; time.time() se None.
+
+        Returns:
+            tuple: (xs, ys), com o centro de cada faixa em segundos desde a época Unix.
+        """
+        now = time.time() if now is None else now
+        if self.origin is None:
+            return [], []
+        last = self.bin(now) if now >= self.origin else len(self.frames) - 1
+        width = self.bin_width
+        xs, ys = [], []
+        for index in range(last + 1):
+            frames = self.frames[index]
+            start = self.origin + index * width
+            if kind == 'rate':
+                duration = min(width, now - start) if index == last else width
+                if duration > 0:
+                    xs.append(start + duration / 2)
+                    ys.append(frames / duration)
+            elif kind == 'error_ratio':
+                if frames:
+                    xs.append(start + width / 2)
+                    ys.append(self.errors[index] / frames)
+            elif self.value_count[index]:
+                xs.append(start + width / 2)
+                ys.append(self.value_sum[index] / self.value_count[index])
+        return xs, ys
+
+    def downsampled(self, kind, threshold=MAX_POINTS, now=None):
+        """Retorna uma série derivada reduzida por lttb a no máximo threshold pontos."""
+        xs, ys = self.series(kind, now)
+        return lttb(xs, ys, threshold)
@@ -0,0 +1,251 @@
+'''
+@file TransmitScheduler.py
+@brief Módulo para agendamento periódico de envios sem deriva.
+
+Este módulo fornece uma classe MultiStreamScheduler que multiplexa vários
+fluxos, cada um com o seu intervalo, em uma única porta e thread. Os envios
+seguem prazos absolutos do relógio monotônico, de modo que o tempo de escrita
+e o atraso do sistema operacional não se acumulam ao longo da transmissão. A
+classe StreamStats guarda as estatísticas de atraso (lateness) e jitter de
+cada fluxo.
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import heapq
+import math
+import threading
+import time
+
+'''Definição de Constantes'''
+SPIN_THRESHOLD = 0.0005  # Parte final da espera feita em espera ativa, em segundos
+MAX_CATCH_UP = 10  # Prazos perdidos recuperados antes de começar a pular envios
+
+def sleep_until(deadline_ns, stop_event=None, spin_threshold=SPIN_THRESHOLD):
+    """Aguarda até o instante deadline_ns do relógio monotônico.
+
+    A maior parte da espera é feita dormindo; os últimos spin_threshold segundos
+    são feitos em espera ativa, para não depender da resolução do escalonador.
+
+    Args:
+        deadline_ns (int): O prazo, em nanossegundos de time.monotonic_ns.
+        stop_event (threading.Event): Interrompe a espera quando definido.
+        spin_threshold (float): Duração da espera ativa final, em segundos; 0 desativa.
+
+    Returns:
+        bool: False se a espera foi interrompida pelo stop_event.
+    """
+    spin_ns = int(spin_threshold * 1e9)
+    remaining = deadline_ns - time.monotonic_ns()
+    if remaining > spin_ns:
+        timeout = (remaining - spin_ns) / 1e9
+        if stop_event is not None:
+            if stop_event.wait(timeout):
+                return False
+        else:
+            time.sleep(timeout)
+    while time.monotonic_ns() < deadline_ns:
+        pass
+    return True
+
+def interval_to_ns(interval):
+    """Converte o intervalo de um fluxo periódico em nanossegundos.
+
+    Args:
+        interval (float): O intervalo entre envios, em segundos.
+
+    Returns:
+        int: O intervalo, em nanossegundos.
+
+    Raises:
+        ValueError: Se o intervalo não for positivo (um fluxo sem intervalo
+            venceria sempre e nunca liberaria o agendador).
+    """
+    interval_ns = int(interval * 1e9)
+    if interval_ns <= 0:
+        raise ValueError(f"O intervalo deve ser positivo, não {interval}")
+    return interval_ns
+
+class StreamStats:
+    """Classe para estatísticas de atraso e jitter de um fluxo periódico."""
+
+    def __init__(self, interval):
+        """Inicializa uma nova instância de StreamStats.
+
+        Args:
+            interval (float): O intervalo configurado do fluxo, em segundos.
+        """
+        self.interval = interval
+        self.count = 0
+        self.skipped = 0
+        self.first_ns = None
+        self.last_ns = None
+        self.lateness_mean = 0.0
+        self.lateness_m2 = 0.0
+        self.lateness_max = 0
+        self.jitter_max = 0
+
+    def record(self, deadline_ns, actual_ns):
+        """Registra um envio.
+
+        Args:
+            deadline_ns (int): O prazo do envio.
+            actual_ns (int): O instante em que o envio começou.
+        """
+        lateness = actual_ns - deadline_ns
+        self.count += 1
+        # Média e variância incrementais (Welford)
+        delta = lateness - self.lateness_mean
+        self.lateness_mean += delta / self.count
+        self.lateness_m2 += delta * (lateness - self.lateness_mean)
+        if lateness > self.lateness_max:
+            self.lateness_max = lateness
+        if self.last_ns is not None:
+            jitter = abs(actual_ns - self.last_ns - self.interval * 1e9)
+            if jitter > self.jitter_max:
+                self.jitter_max = jitter
+        else:
+            self.first_ns = actual_ns
+        self.last_ns = actual_ns
+
+    def effective_rate(self):
+        """Retorna a taxa média de envio observada, em envios por segundo."""
+        if self.count < 2:
+            return 0.0
+        return (self.count - 1) / ((self.last_ns - self.first_ns) / 1e9)
+
+    def summary(self):
+        """Retorna um resumo das estatísticas, com tempos em microssegundos.
+
+        Returns:
+            dict: Envios, envios pulados, taxa configurada e observada, atraso
+            médio, desvio padrão e máximo, e jitter máximo.
+        """
+        variance = self.lateness_m2 / self.count if self.count else 0.0
+        return {
+            'count': self.count,
+            'skipped': self.skipped,
+            'target_rate': 1 / self.interval if self.interval else 0.0,
+            'effective_rate': self.effective_rate(),
+            'lateness_mean_us': self.lateness_mean / 1e3,
+            'lateness_std_us': math.sqrt(variance) / 1e3,
+            'lateness_max_us': self.lateness_max / 1e3,
+            'jitter_max_us': self.jitter_max / 1e3,
+        }
+
+class MultiStreamScheduler:
+    """Classe para vários fluxos periódicos multiplexados em uma única porta e thread.
+
+    Os próximos prazos de todos os fluxos ficam em um heap; a thread dorme até
+    o prazo mais próximo e, quando vários fluxos vencem ao mesmo tempo, os seus
+    pacotes são concatenados e enviados com uma única escrita.
+    """
+
+    def __init__(self, spin_threshold=SPIN_THRESHOLD, max_catch_up=MAX_CATCH_UP):
+        """Inicializa uma nova instância de MultiStreamScheduler.
+
+        Args:
+            spin_threshold (float): Duração da espera ativa antes de cada prazo, em segundos.
+            max_catch_up (int): Quantidade máxima de prazos perdidos recuperados por fluxo.
+        """
+        self.spin_threshold = spin_threshold
+        self.max_catch_up = max_catch_up
+        self.streams = {}  # Identificador do fluxo -> [pacote, intervalo_ns, estatísticas, geração]
+        self.heap = []
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.write_count = 0
+        self.profiler = None  # StageProfiler opcional para as etapas de cada envio
+
+    def add_stream(self, stream_id, packet, interval):
+        """Inicia (ou reconfigura) um fluxo; o primeiro envio é imediato.
+
+        Args:
+            stream_id: Identificador do fluxo.
+            packet: Os bytes enviados a cada intervalo, ou uma função sem
+                argumentos que os retorna a cada envio (o resultado é copiado,
+                de modo que a função pode reaproveitar o mesmo buffer).
+            interval (float): O intervalo entre envios, em segundos.
+
+        Returns:
+            StreamStats: As estatísticas do fluxo.
+
+        Raises:
+            ValueError: Se o intervalo não for positivo.
+        """
+        interval_ns = interval_to_ns(interval)
+        with self.lock:
+            self.sequence += 1
+            stats = StreamStats(interval)
+            self.streams[stream_id] = [packet, interval_ns, stats, self.sequence]
+            heapq.heappush(self.heap, (time.monotonic_ns(), self.sequence, stream_id))
+        self.wake_event.set()
+        return stats
+
+    def remove_stream(self, stream_id):
+        """Interrompe um fluxo.
+
+        Returns:
+            StreamStats: As estatísticas do fluxo, ou None se ele não existia.
+        """
+        with self.lock:
+            stream = self.streams.pop(stream_id, None)
+        self.wake_event.set()
+        return stream[2] if stream else None
+
+    def stop(self):
+        """Interrompe o laço de run."""
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def run(self, write):
+        """Executa os envios de todos os fluxos até que stop seja chamado.
+
+        Args:
+            write: Função que recebe os bytes a escrever (por exemplo, Serial.write).
+        """
+        while not self.stop_event.is_set():
+            self.wake_event.clear()
+            with self.lock:
+                deadline = self.heap[0][0] if self.heap else None
+            if deadline is None:
+                self.wake_event.wait()
+                continue
+            if not sleep_until(deadline, self.wake_event, self.spin_threshold):
+                continue  # Fluxos alterados: recalcula o prazo mais próximo
+            actual = time.monotonic_ns()
+            sampled = self.profiler is not None and self.profiler.sample('transmit')
+            if sampled:
+                render_start = time.perf_counter_ns()
+            packets = []
+            with self.lock:
+                while self.heap and self.heap[0][0] <= actual:
+                    due, generation, stream_id = heapq.heappop(self.heap)
+                    stream = self.streams.get(stream_id)
+                    if stream is None or stream[3] != generation:
+                        continue  # Fluxo removido ou reconfigurado
+                    packet, interval_ns, stats, _ = stream
+                    # Cópia do pacote gerado: o mesmo buffer pode ser reaproveitado por
+                    # packet() em uma recuperação de prazos perdidos deste mesmo lote
+                    packets.append(bytes(packet()) if callable(packet) else packet)
+                    stats.record(due, actual)
+                    next_due = due + interval_ns
+                    behind = actual - next_due
+                    if behind > self.max_catch_up * interval_ns:
+                        missed = behind // interval_ns
+                        stats.skipped += missed
+                        next_due += missed * interval_ns
+                    heapq.heappush(self.heap, (next_due, generation, stream_id))
+            if packets:
+                if sampled:
+                    write_start = time.perf_counter_ns()
+                    self.profiler.record('transmit;lateness', actual - deadline, len(packets))
+                    self.profiler.record('transmit;render', write_start - render_start, len(packets))
+                write(b''.join(packets))
+                self.write_count += 1
+                if sampled:
+                    self.profiler.record('transmit;write', time.perf_counter_ns() - write_start, len(packets))
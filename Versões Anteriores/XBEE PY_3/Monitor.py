@@ -1,36 +1,142 @@
-import serial 
+import serial
 import threading
 import time
+from collections import deque
+
+class LatencyHistogram:
+    # Histograma no estilo HDR: faixas em potências de 2, cada uma dividida em 2**(sub_bucket_bits-1) partes,
+    # com erro relativo de no máximo 2**-(sub_bucket_bits-1) e memória fixa, sem guardar as amostras
+    def __init__(self, sub_bucket_bits = 6):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = []
+        self.count , self.total , self.min , self.max = 0 , 0 , None , None
+
+    def __bucket__(self, value):
+        bits = self.sub_bucket_bits
+        if value < (1 << bits):
+            return value
+        shift = value.bit_length() - bits
+        return (1 << bits) + (shift - 1) * (1 << (bits - 1)) + (value >> shift) - (1 << (bits - 1))
+
+    def __bucket_upper__(self, index):
+        bits = self.sub_bucket_bits
+        if index < (1 << bits):
+            return index
+        shift , sub = divmod(index - (1 << bits), 1 << (bits - 1))
+        return ((sub + (1 << (bits - 1)) + 1) << (shift + 1)) - 1
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = self.__bucket__(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.count , self.total = self.count + 1 , self.total + value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction):
+        if not self.count:
+            return None
+        target , seen = max(1, int(fraction * self.count + 0.5)) , 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.__bucket_upper__(index), self.max)
+        return self.max
+
+    def summary(self, fractions = (0.5, 0.9, 0.99, 0.999)):
+        report = {'count': self.count, 'min': self.min, 'max': self.max, 'mean': self.total / self.count if self.count else None}
+        report.update({f'p{fraction * 100:g}': self.percentile(fraction) for fraction in fractions})
+        return report
 
 class MonitorSerial:
-    def __init__(self, port, boudrate, timeout = 0.1):
+    # seq_index: posição do byte de sequência no quadro enviado (e na resposta); None correlaciona pela ordem de chegada
+    # response_command: byte de comando das respostas; None aceita qualquer quadro recebido como resposta
+    def __init__(self, port, boudrate, timeout = 0.1, seq_index = None, response_command = None, rtt_timeout = 5.0, report_period = 5.0):
         self.port          , self.boudrate      = port , boudrate
         self.tx_callback   , self.rx_callback   = lambda response : print(f'tx {response[0]} - { response[1] }') , lambda response : print(f'rx {response[0]} - { [h.hex() for h in response[1]] }')
+        self.rtt_callback = lambda report : print(f'rtt (us) {report}')
         self.flagStop = True
         self.timeout = timeout
+        self.seq_index , self.response_command = seq_index , response_command
+        self.rtt_timeout , self.report_period = rtt_timeout , report_period
+        self.latency = LatencyHistogram()
+        self.pending , self.pending_lock = deque() , threading.Lock()
+        self.sequence , self.lost , self.unmatched = 0 , 0 , 0
+
+    def __next_sequence__(self):
+        # O byte de sequência nunca vale AB nem CD, para não quebrar o enquadramento
+        self.sequence = (self.sequence + 1) % 256
+        while self.sequence in (0xAB, 0xCD):
+            self.sequence = (self.sequence + 1) % 256
+        return self.sequence
 
     def __tx_routine__(self, msg, period):
         try:
+            packet = bytearray.fromhex(msg) if msg else None
             while self.flagStop:
-                if msg:
-                    self.__serial_port__.write(  bytes.fromhex(msg) )
-                    self.tx_callback((time.time(),msg))
+                if packet:
+                    sequence = None
+                    if self.seq_index is not None:
+                        sequence = packet[self.seq_index] = self.__next_sequence__()
+                    with self.pending_lock:
+                        self.pending.append((sequence, time.perf_counter_ns()))
+                    self.__serial_port__.write( packet )
+                    self.tx_callback((time.time(),msg if sequence is None else packet.hex(' ').upper()))
                 time.sleep(period)
                 pass
         except Exception as e:
             print(f"{e}")
         pass
 
+    def __match__(self, frame, arrival):
+        # Associa um quadro recebido ao envio correspondente e registra o tempo de ida e volta
+        if self.response_command is not None and (len(frame) < 2 or frame[1] != self.response_command):
+            return
+        with self.pending_lock:
+            while self.pending and arrival - self.pending[0][1] > self.rtt_timeout * 1e9:
+                self.pending.popleft()
+                self.lost += 1
+            if self.seq_index is None:
+                sent = self.pending.popleft() if self.pending else None
+            else:
+                sequence = frame[self.seq_index] if len(frame) > self.seq_index else None
+                sent = next((item for item in self.pending if item[0] == sequence), None)
+                if sent:
+                    self.pending.remove(sent)
+        if sent:
+            self.latency.record((arrival - sent[1]) / 1000)
+        else:
+            self.unmatched += 1
+
+    def rtt_report(self):
+        report = self.latency.summary()
+        report.update({'lost': self.lost, 'unmatched': self.unmatched, 'pending': len(self.pending)})
+        return report
+
     def __rx_routine__(self):
         try:
             buffer , timeref = [] , time.time()
+            frame , next_report = None , time.monotonic() + self.report_period
             while self.flagStop:
                 byte = self.__serial_port__.read(1)
                 if byte:
                     buffer.append(byte)
+                    # Quadro AB ... CD completo no instante em que chega o CD
+                    if byte == b'\xab':
+                        frame = bytearray(byte)
+                    elif frame is not None:
+                        frame += byte
+                        if byte == b'\xcd':
+                            self.__match__(frame, time.perf_counter_ns())
+                            frame = None
                 else:
                     self.rx_callback((timeref,buffer))
                     buffer , timeref = [] , time.time()
+                if self.report_period and time.monotonic() >= next_report:
+                    self.rtt_callback(self.rtt_report())
+                    next_report += self.report_period
         except KeyboardInterrupt:
             exit()
 
@@ -44,10 +150,11 @@ class MonitorSerial:
             rx_thread.join()
             tx_thread.join()
             self.__serial_port__.close()
+            self.rtt_callback(self.rtt_report())
         except KeyboardInterrupt:
             print("Finished")
         except Exception as e:
             print(f"Error Starting Serial {e}")
 
     def stop(self):
-        self.flagStop = False
\ No newline at end of file
+        self.flagStop = False
@@ -0,0 +1,125 @@
+'''
+@file VirtualTable.py
+@brief Módulo com uma tabela virtualizada para grandes volumes de dados.
+
+Este módulo fornece uma classe VirtualTable, uma ttk.Treeview que mantém apenas
+as linhas visíveis na tela e as preenche sob demanda a partir de um
+armazenamento externo, de modo que a memória e o custo de atualização não
+dependem da quantidade de linhas capturadas.
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import tkinter as tk
+from tkinter import ttk
+
+'''Definição de Constantes'''
+DEFAULT_ROW_HEIGHT = 20
+
+class VirtualTable(ttk.Frame):
+    """Classe para exibição virtualizada de linhas, da mais recente para a mais antiga."""
+
+    def __init__(self, master, columns, get_row, row_count, first_row=lambda: 0, height=10, **kwargs):
+        """Inicializa uma nova instância de VirtualTable.
+
+        Args:
+            master: O widget pai.
+            columns (tuple): Os nomes das colunas.
+            get_row: Função que recebe o índice absoluto (0 = linha mais antiga)
+                e retorna a tupla de valores da linha.
+            row_count: Função que retorna a quantidade de linhas armazenadas.
+            first_row: Função que retorna o índice da linha mais antiga ainda
+                disponível, para armazenamentos que descartam linhas antigas.
+            height (int): Quantidade inicial de linhas visíveis.
+            kwargs: Argumentos de palavra-chave repassados ao ttk.Frame.
+        """
+        ttk.Frame.__init__(self, master, **kwargs)
+        self.get_row = get_row
+        self.row_count = row_count
+        self.first_row = first_row
+        self.visible_rows = height
+        self.base = 0  # Índice da primeira linha ainda exibida após limpar a tabela
+        self.anchor = None  # Índice da linha do topo; None acompanha a mais recente
+        self.items = []
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=height)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', self.on_configure)
+        self.tree.bind('<MouseWheel>', lambda event: self.yview('scroll', -event.delta // 120, 'units'))
+        self.tree.bind('<Button-4>', lambda event: self.yview('scroll', -1, 'units'))
+        self.tree.bind('<Button-5>', lambda event: self.yview('scroll', 1, 'units'))
+
+    def heading(self, column, **kwargs):
+        """Configura o cabeçalho de uma coluna."""
+        self.tree.heading(column, **kwargs)
+
+    def first_index(self):
+        """Retorna o índice da linha mais antiga que pode ser exibida."""
+        return max(self.base, self.first_row())
+
+    def refresh(self):
+        """Preenche as linhas visíveis a partir do armazenamento e atualiza a barra de rolagem."""
+        count = self.row_count()
+        first = self.first_index()
+        total = count - first
+        top = count - 1 if self.anchor is None else max(self.anchor, first)
+        stop = max(top - self.visible_rows, first - 1)
+        rows = [self.get_row(index) for index in range(top, stop, -1)]
+
+        # Reaproveita os itens já criados na árvore
+        while len(self.items) < len(rows):
+            self.items.append(self.tree.insert('', tk.END))
+        while len(self.items) > len(rows):
+            self.tree.delete(self.items.pop())
+        for item, values in zip(self.items, rows):
+            self.tree.item(item, values=values)
+
+        if total > 0:
+            offset = count - 1 - top
+            self.scrollbar.set(offset / total, (offset + len(rows)) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args):
+        """Trata os comandos de rolagem da barra de rolagem e do mouse."""
+        count = self.row_count()
+        total = count - self.first_index()
+        offset = 0 if self.anchor is None else count - 1 - self.anchor
+        if args[0] == 'moveto':
+            offset = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            offset += step * self.visible_rows if args[2] == 'pages' else step
+        self.scroll_to(offset)
+
+    def scroll_to(self, offset):
+        """Posiciona o topo da tabela a offset linhas da mais recente.
+
+        Args:
+            offset (int): Distância, em linhas, da linha mais recente.
+        """
+        count = self.row_count()
+        offset = max(0, min(offset, count - self.first_index() - self.visible_rows))
+        self.anchor = None if offset == 0 else count - 1 - offset
+        self.refresh()
+
+    def on_configure(self, event):
+        """Recalcula a quantidade de linhas visíveis quando a tabela é redimensionada."""
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or DEFAULT_ROW_HEIGHT)
+        visible_rows = max(1, event.height // row_height - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.refresh()
+
+    def clear(self):
+        """Oculta todas as linhas armazenadas até o momento."""
+        self.base = self.row_count()
+        self.anchor = None
+        self.refresh()
@@ -15,27 +15,67 @@ from tkinter import ttk
 from datetime import datetime
 import threading
 import os
+import time
 from RealXBeeData import RealXBeeData
+from VirtualTable import VirtualTable
+from LiveChart import LiveCharts
+from PacketStore import format_timestamp
+
+# Intervalo de atualização da interface (~30 Hz) e limite de quadros por atualização
+REFRESH_INTERVAL_MS = 33
+MAX_FRAMES_PER_REFRESH = 2000
+
+# Quantidade máxima de linhas mantidas no monitor serial e folga antes do corte
+MAX_MONITOR_LINES = 1000
+MONITOR_TRIM_SLACK = 200
+
+# Intervalo de atualização da barra de status com as métricas, em segundos
+STATUS_INTERVAL = 1.0
+
+# Intervalo de atualização dos gráficos, em segundos
+CHART_INTERVAL = 1.0
 
 class XBeeDataViewer(tk.Tk):
     """Classe para visualização de dados do XBee."""
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, port="COM6", baudrate=9600, monitor_line_cap=MAX_MONITOR_LINES, metrics_port=None,
+                 metrics_snapshot=None, profile_every=None, **kwargs):
         """Inicializa a aplicação XBeeDataViewer.
 
         Configura a interface gráfica e a comunicação com o dispositivo XBee.
 
         Args:
             args: Argumentos posicionais.
+            port (str): A porta serial do dispositivo XBee (ou do XBeeEmulator).
+            baudrate (int): A taxa de baud do dispositivo XBee.
+            monitor_line_cap (int): Quantidade máxima de linhas mantidas no monitor serial.
+            metrics_port (int): Porta em localhost para publicar as métricas no
+                formato do Prometheus; sem publicação se None.
+            metrics_snapshot (str): Arquivo para instantâneos JSON periódicos das métricas.
+            profile_every (int): Ativa a medição das etapas em 1 de cada
+                profile_every iterações; F12 grava o detalhamento. Desativada se None.
             kwargs: Argumentos de palavra-chave.
         """
         tk.Tk.__init__(self, *args, **kwargs)
 
+        self.monitor_line_cap = monitor_line_cap
+
         self.title("XBee Data Viewer")
         self.geometry("900x700")
 
         # Utilizar RealXBeeData para comunicação real
-        self.real_xbee = RealXBeeData(self, port="COM6", baudrate=9600)
+        self.real_xbee = RealXBeeData(self, port=port, baudrate=baudrate)
+        self.refresh_time = self.real_xbee.metrics.histogram('gui_refresh_seconds',
+                                                             "Duração de uma atualização da interface")
+        self.last_status = 0.0
+        self.last_chart = 0.0
+        if metrics_port is not None:
+            self.real_xbee.metrics.serve(metrics_port)
+        if metrics_snapshot:
+            self.real_xbee.metrics.start_snapshots(metrics_snapshot)
+        if profile_every:
+            self.real_xbee.enable_profiling(profile_every)
+            self.bind('<F12>', lambda event: self.dump_profile())
 
         # Configurar a chamada de download_data ao fechar a aplicação
         self.protocol("WM_DELETE_WINDOW", self.exit_application)
@@ -43,6 +83,9 @@ class XBeeDataViewer(tk.Tk):
         # Criar e configurar widgets
         self.create_widgets()
 
+        # Iniciar a atualização periódica da interface
+        self.after(REFRESH_INTERVAL_MS, self.refresh)
+
     def create_widgets(self):
         """Cria e configura os widgets da interface gráfica."""
         self.paned_window = ttk.PanedWindow(self, orient=tk.VERTICAL)
@@ -60,11 +103,21 @@ class XBeeDataViewer(tk.Tk):
         self.data_analysis_label = tk.Label(self, text="Análise de Dados:")
         self.data_analysis_label.pack()
 
-        self.data_tree = ttk.Treeview(self, columns=('Source', 'Data', 'Timestamp'), show='headings', height=10)
+        # Tabela e gráficos em abas; os gráficos só são redesenhados com a sua aba visível
+        self.analysis_tabs = ttk.Notebook(self)
+        self.analysis_tabs.pack(expand=True, fill='both')
+
+        self.data_tree = VirtualTable(self.analysis_tabs, columns=('Source', 'Data', 'Timestamp'), get_row=self.data_row,
+                                      row_count=lambda: self.real_xbee.packets.total_count,
+                                      first_row=lambda: self.real_xbee.packets.first_index, height=10)
         self.data_tree.heading('Source', text='Source')
         self.data_tree.heading('Data', text='Data')
         self.data_tree.heading('Timestamp', text='Timestamp')
-        self.data_tree.pack(expand=True, fill='both')
+        self.analysis_tabs.add(self.data_tree, text="Tabela")
+
+        self.charts = LiveCharts(self.analysis_tabs)
+        self.analysis_tabs.add(self.charts, text="Gráficos")
+        self.analysis_tabs.bind('<<NotebookTabChanged>>', lambda event: self.after_idle(self.charts.draw))
 
         self.button_frame = tk.Frame(self)
         self.button_frame.pack()
@@ -87,6 +140,9 @@ class XBeeDataViewer(tk.Tk):
         self.exit_button = tk.Button(self.button_frame, text="Sair", command=self.exit_application)
         self.exit_button.grid(row=0, column=5, padx=10, pady=10)
 
+        self.status_bar = tk.Label(self, anchor='w', relief=tk.SUNKEN)
+        self.status_bar.pack(fill='x', side=tk.BOTTOM)
+
     def start_real_communication(self):
         """Inicia a comunicação com o dispositivo XBee."""
         self.real_xbee.start_real_communication()
@@ -99,26 +155,120 @@ class XBeeDataViewer(tk.Tk):
         """Baixa os dados do dispositivo XBee."""
         self.real_xbee.download_data()
 
+    def refresh(self):
+        """Executa uma atualização da interface e reagenda a próxima.
+
+        A próxima atualização é agendada mesmo se esta falhar (por exemplo, com
+        um erro de disco ao gravar o log); o erro é exibido pelo Tk e a
+        interface continua consumindo o buffer circular.
+        """
+        try:
+            self.update_views()
+        finally:
+            self.after(REFRESH_INTERVAL_MS, self.refresh)
+
+    def update_views(self):
+        """Exibe os quadros recebidos desde a última atualização.
+
+        Todos os quadros pendentes são exibidos com uma única inserção no monitor
+        serial e um único lote na árvore de dados, de modo que o custo da
+        interface depende da taxa de atualização e não da taxa de pacotes.
+        """
+        start = time.perf_counter()
+        profiler = self.real_xbee.profiler
+        sampled = profiler is not None and profiler.sample('refresh')
+        batch = self.real_xbee.drain_frames(MAX_FRAMES_PER_REFRESH)
+        if batch:
+            if sampled:
+                monitor_start = time.perf_counter_ns()
+            self.update_serial_monitor(''.join(f"{data['timestamp']}, Data: {data['data']}\n" for data in batch))
+            if sampled:
+                table_start = time.perf_counter_ns()
+            self.update_data_tree_batch(batch)
+            if sampled:
+                charts_start = time.perf_counter_ns()
+            packets = self.real_xbee.packets
+            self.charts.add_packets(packets, packets.total_count - len(batch), packets.total_count)
+            if sampled:
+                profiler.record('refresh;tk_monitor', table_start - monitor_start, len(batch))
+                profiler.record('refresh;tk_table', charts_start - table_start, len(batch))
+                profiler.record('refresh;charts', time.perf_counter_ns() - charts_start, len(batch))
+        if start - self.last_status >= STATUS_INTERVAL:
+            self.update_status_bar()
+            self.last_status = start
+        if start - self.last_chart >= CHART_INTERVAL:
+            self.charts.draw()
+            self.last_chart = start
+        self.refresh_time.observe(time.perf_counter() - start)
+
+    def dump_profile(self):
+        """Grava o detalhamento das etapas em perfil_<instante>.json e .folded (pilhas colapsadas)."""
+        base = time.strftime('perfil_%Y%m%d-%H%M%S')
+        self.real_xbee.profiler.dump(f"{base}.json")
+        self.real_xbee.profiler.dump(f"{base}.folded")
+        self.update_serial_monitor(f"Perfil gravado em {base}.json e {base}.folded\n")
+
+    def update_status_bar(self):
+        """Exibe as principais métricas da captura na barra de status."""
+        metrics = self.real_xbee.metrics.snapshot()
+
+        def milliseconds(histogram):
+            p99 = metrics[histogram]['p99']
+            if p99 is None:
+                return '-'
+            return f"{'> ' if metrics[histogram]['overflow'] else ''}{p99 * 1000:.1f} ms"
+
+        self.status_bar.config(text=(
+            f"Bytes: {metrics['bytes_read_total']}  |  Quadros: {metrics['frames_total']}  |  "
+            f"Erros: {metrics['error_frames_total']}  |  Ressincronizações: {metrics['resyncs_total']}  |  "
+            f"Fila: {metrics['queue_depth']}  |  Atraso p99: {milliseconds('dispatch_lag_seconds')}  |  "
+            f"Disco p99: {milliseconds('disk_write_seconds')}"))
+
     def update_serial_monitor(self, text):
-        """Atualiza o monitor serial com o texto especificado."""
+        """Atualiza o monitor serial com o texto especificado.
+
+        Quando o monitor ultrapassa o limite de linhas mais uma folga, as linhas
+        mais antigas são removidas de uma só vez.
+        """
         self.serial_monitor.insert(tk.END, text)
+        line_count = int(self.serial_monitor.index('end-1c').split('.')[0])
+        if line_count > self.monitor_line_cap + MONITOR_TRIM_SLACK:
+            self.serial_monitor.delete(1.0, f"{line_count - self.monitor_line_cap}.0")
         self.serial_monitor.see(tk.END)
 
     def update_data_tree(self, data):
         """Atualiza a árvore de dados com os dados especificados."""
-        values = (data['source'], data['data'], data['timestamp'])
-        self.data_tree.insert('', 0, values=values)
+        self.update_data_tree_batch([data])
+
+    def update_data_tree_batch(self, batch):
+        """Atualiza a árvore de dados após a chegada de um lote de dados.
+
+        Os dados já estão em packets; a tabela virtualizada apenas
+        materializa novamente as linhas visíveis.
+        """
+        self.data_tree.refresh()
+
+    def data_row(self, index):
+        """Retorna os valores da linha index (0 = primeiro quadro da sessão) da árvore de dados."""
+        packets = self.real_xbee.packets
+        return (self.real_xbee.sources[packets.source(index)], packets.hex(index),
+                format_timestamp(packets.timestamp(index)))
 
     def clear_monitor(self):
         """Limpa o monitor serial."""
         self.serial_monitor.delete(1.0, tk.END)
 
     def clear_data(self):
-        """Limpa a árvore de dados."""
-        self.data_tree.delete(*self.data_tree.get_children())
+        """Limpa a árvore de dados e os gráficos."""
+        self.data_tree.clear()
+        self.charts.clear()
 
     def exit_application(self):
         """Fecha a aplicação, interrompendo a comunicação e baixando os dados do dispositivo XBee."""
-        self.real_xbee.download_data()  # Chama a função download_data ao fechar a aplicação
         self.stop_real_communication()
+        self.real_xbee.join_threads()
+        self.real_xbee.drain_frames()  # Registra os quadros ainda pendentes no buffer circular
+        self.real_xbee.download_data()  # Chama a função download_data ao fechar a aplicação
+        self.real_xbee.close_log()
+        self.real_xbee.metrics.stop()
         self.destroy()
@@ -0,0 +1,204 @@
+'''
+@file XBeeEmulator.py
+@brief Módulo com um emulador do nó XBee de campo em um pseudo-terminal (Linux).
+
+Este módulo fornece uma classe XBeeEmulator que abre um par de pseudo-terminais
+e se comporta como o nó de campo do outro lado: envia quadros
+AB 81 10 xx xx xx CD na taxa configurada, injeta quadros de erro E1 e ruído na
+linha com as probabilidades configuradas e responde aos quadros recebidos.
+RealXBeeData, MultiPortCapture, MonitorSerial e envia.py podem abrir o caminho
+do pseudo-terminal (XBeeEmulator.port) como se fosse a porta do rádio.
+
+Uso: python XBeeEmulator.py [--rate 10] [--error-probability 0.01] ...
+
+@author Francisco Gilson Pereira Almeida Filho
+@date 18 de Outubro de 2026
+'''
+
+'''Importação de Bibliotecas'''
+import argparse
+import os
+import random
+import selectors
+import threading
+import time
+import tty
+from FrameParser import FrameParser
+
+'''Definição de Constantes'''
+DATA_COMMAND = 0x81
+ERROR_COMMAND = 0xE1
+RESPONSE_COMMAND = 0x27
+DEFAULT_PAYLOAD = bytes.fromhex('FA 8D D0')
+ERROR_FRAME = bytes.fromhex('AB E1 10 2C BD CD')
+MAX_NOISE_BYTES = 8
+# Bytes permitidos no payload aleatório: nunca os delimitadores AB e CD, como no Benchmark
+PAYLOAD_BYTES = bytes(byte for byte in range(256) if byte not in (0xAB, 0xCD))
+
+def open_pty():
+    """Abre um par de pseudo-terminais em modo bruto (sem eco nem tradução de bytes).
+
+    Returns:
+        tuple: (master, slave, path), com os descritores dos dois lados e o
+        caminho do lado escravo, que os clientes abrem como uma porta serial.
+    """
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    return master, slave, os.ttyname(slave)
+
+class XBeeEmulator:
+    """Classe para emulação do nó XBee de campo em um par de pseudo-terminais."""
+
+    def __init__(self, rate=1.0, payload=DEFAULT_PAYLOAD, error_probability=0.0, noise_probability=0.0,
+                 respond=True, baudrate=None, seed=None):
+        """Inicializa uma nova instância de XBeeEmulator e abre o pseudo-terminal.
+
+        Args:
+            rate (float): Quadros de dados enviados por segundo; 0 desativa o envio
+                periódico. Pode ser alterada com o emulador em execução.
+            payload (bytes): Os três bytes de payload dos quadros de dados; None
+                gera um payload aleatório (sem AB nem CD) para cada quadro.
+            error_probability (float): Probabilidade de um quadro de erro E1 no lugar de um quadro de dados.
+            noise_probability (float): Probabilidade de bytes de ruído antes de cada quadro.
+            respond (bool): Responde a cada quadro recebido com o comando 0x27 e o mesmo payload.
+            baudrate (int): Taxa de baud simulada; limita a vazão de saída ao tempo
+                de transmissão de 10 bits por byte. Sem limite se None.
+            seed: Semente do gerador aleatório, para execuções reproduzíveis.
+        """
+        self.rate = rate
+        self.payload = payload
+        self.error_probability = error_probability
+        self.noise_probability = noise_probability
+        self.respond = respond
+        self.baudrate = baudrate
+        self.random = random.Random(seed)
+        self.parser = FrameParser()
+        self.stop_flag = threading.Event()
+        self.thread = None
+        self.frames_sent = 0
+        self.errors_sent = 0
+        self.noise_bytes_sent = 0
+        self.responses_sent = 0
+        self.frames_received = 0
+        self.dropped_bytes = 0
+
+        self.master, self.slave, self.port = open_pty()
+        os.set_blocking(self.master, False)
+
+    def start(self):
+        """Inicia o emulador em uma thread."""
+        self.stop_flag.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Interrompe o emulador e aguarda a sua thread."""
+        self.stop_flag.set()
+        if self.thread:
+            self.thread.join()
+
+    def close(self):
+        """Interrompe o emulador e fecha o pseudo-terminal."""
+        self.stop()
+        os.close(self.master)
+        os.close(self.slave)
+
+    def data_frame(self):
+        """Monta o próximo quadro de dados (ou de erro) a ser enviado."""
+        if self.error_probability and self.random.random() < self.error_probability:
+            self.errors_sent += 1
+            return ERROR_FRAME
+        payload = self.payload if self.payload is not None else bytes(self.random.choices(PAYLOAD_BYTES, k=3))
+        return bytes((0xAB, DATA_COMMAND, 0x10)) + payload + b'\xCD'
+
+    def noise(self):
+        """Retorna os bytes de ruído a inserir antes do próximo quadro (possivelmente vazio)."""
+        if self.noise_probability and self.random.random() < self.noise_probability:
+            # Ruído sem o byte de início, para que a ressincronização seja observável
+            noise = bytes(self.random.choice([b for b in range(256) if b != 0xAB])
+                          for _ in range(self.random.randint(1, MAX_NOISE_BYTES)))
+            self.noise_bytes_sent += len(noise)
+            return noise
+        return b''
+
+    def write(self, data):
+        """Escreve no lado mestre, respeitando a taxa de baud simulada.
+
+        Bytes que não cabem no buffer do pseudo-terminal (ninguém lendo do
+        outro lado) são descartados e contados em dropped_bytes.
+        """
+        if self.baudrate:
+            time.sleep(len(data) * 10 / self.baudrate)
+        try:
+            written = os.write(self.master, data)
+        except BlockingIOError:
+            written = 0
+        self.dropped_bytes += len(data) - written
+
+    def handle_input(self):
+        """Lê os quadros recebidos pelo emulador e responde a cada um deles."""
+        try:
+            chunk = os.read(self.master, 4096)
+        except (BlockingIOError, OSError):
+            # EIO enquanto nenhum processo tem o lado escravo aberto
+            return
+        for frame in self.parser.feed(chunk):
+            self.frames_received += 1
+            if self.respond:
+                self.write(bytes((0xAB, RESPONSE_COMMAND)) + frame[2:])
+                self.responses_sent += 1
+
+    def run(self):
+        """Laço do emulador: envia quadros nos prazos e atende os quadros recebidos."""
+        selector = selectors.DefaultSelector()
+        selector.register(self.master, selectors.EVENT_READ)
+        deadline = time.monotonic_ns()
+        try:
+            while not self.stop_flag.is_set():
+                # A taxa pode ser alterada com o emulador em execução
+                interval_ns = int(1e9 / self.rate) if self.rate else None
+                if interval_ns is None:
+                    timeout = 0.1
+                    deadline = time.monotonic_ns()
+                else:
+                    timeout = max(0, deadline - time.monotonic_ns()) / 1e9
+                if selector.select(min(timeout, 0.1)):
+                    self.handle_input()
+                if interval_ns is not None and time.monotonic_ns() >= deadline:
+                    self.write(self.noise() + self.data_frame())
+                    self.frames_sent += 1
+                    deadline += interval_ns
+        finally:
+            selector.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Emulador do nó XBee em um pseudo-terminal")
+    parser.add_argument('--rate', type=float, default=1.0, help="quadros de dados por segundo")
+    parser.add_argument('--payload', default='FA 8D D0', help="payload em hexadecimal, ou 'random'")
+    parser.add_argument('--error-probability', type=float, default=0.0)
+    parser.add_argument('--noise-probability', type=float, default=0.0)
+    parser.add_argument('--baudrate', type=int, default=None)
+    parser.add_argument('--no-respond', action='store_true')
+    parser.add_argument('--link', help="cria um link simbólico com este nome para o pseudo-terminal")
+    args = parser.parse_args()
+
+    emulator = XBeeEmulator(rate=args.rate,
+                            payload=None if args.payload == 'random' else bytes.fromhex(args.payload),
+                            error_probability=args.error_probability,
+                            noise_probability=args.noise_probability,
+                            respond=not args.no_respond,
+                            baudrate=args.baudrate)
+    if args.link:
+        if os.path.islink(args.link):
+            os.remove(args.link)
+        os.symlink(emulator.port, args.link)
+    print(f"Emulador XBee em: {args.link or emulator.port}")
+    emulator.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        emulator.close()
+        print(f"Quadros enviados: {emulator.frames_sent} (erros: {emulator.errors_sent}), "
+              f"recebidos: {emulator.frames_received}, respostas: {emulator.responses_sent}")
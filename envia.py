@@ -13,17 +13,23 @@ incluindo a criação dinâmica de botões para envio de pacotes hexadecimais co
 import tkinter as tk
 from serial import Serial
 import threading
+import asyncio
 import time
+from TransmitScheduler import MultiStreamScheduler, StreamStats, MAX_CATCH_UP, interval_to_ns
+from PacketTemplate import PacketTemplate
+from Profiler import StageProfiler
 
 class XBeeInterface:
 
-    def __init__(self, root):
+    def __init__(self, root, profile_every=None):
         """
         Inicializa a aplicação XBeeInterface.
 
         Configura a interface gráfica e as variáveis de controle.
 
         :param root: O widget raiz da aplicação.
+        :param profile_every: Mede as etapas de 1 de cada profile_every envios;
+            o detalhamento é gravado ao parar a transmissão. Desativada se None.
         """
         self.root = root
         self.root.title("XBee Interface")
@@ -33,6 +39,9 @@ class XBeeInterface:
 
         self.buttons = []  # Lista para armazenar os botões dinamicamente criados
         self.is_transmitting = False  # Variável para rastrear se a transmissão está acontecendo
+        self.scheduler = None  # Agendador compartilhado por todos os fluxos em transmissão
+        self.active_streams = {}  # Botão -> título de cada fluxo em transmissão
+        self.profiler = StageProfiler(profile_every) if profile_every else None
 
         # Botão fixo para parar
         self.stop_button = tk.Button(self.buttons_frame, text="Parar", command=self.stop_transmission, state=tk.DISABLED)
@@ -62,7 +71,7 @@ class XBeeInterface:
         tk.Label(button_frame, text="Título:").pack()
         tk.Entry(button_frame, textvariable=title_var).pack()
 
-        tk.Label(button_frame, text="Pacote Hexadecimal:").pack()
+        tk.Label(button_frame, text="Pacote Hexadecimal ({seq}, {ts}, {rand}, {sum}, {xor}):").pack()
         tk.Entry(button_frame, textvariable=packet_var).pack()
 
         tk.Label(button_frame, text="Intervalo de Envio (segundos):").pack()
@@ -77,56 +86,151 @@ class XBeeInterface:
 
     def toggle_transmission(self, button, title, packet, interval):
         """
-        Inicia ou interrompe a transmissão de dados.
+        Inicia ou interrompe a transmissão do fluxo de um botão.
+
+        Cada botão é um fluxo independente, com o seu próprio intervalo; todos
+        os fluxos ativos compartilham a mesma porta e a mesma thread de envio.
 
         :param button: O botão que disparou a ação.
         :param title: O título do botão.
-        :param packet: O pacote hexadecimal a ser transmitido.
+        :param packet: O pacote hexadecimal a ser transmitido, possivelmente com
+            campos dinâmicos (ver PacketTemplate).
         :param interval: O intervalo de envio em segundos.
         """
+        if button in self.active_streams:
+            # Parar apenas este fluxo
+            stats = self.scheduler.remove_stream(button)
+            del self.active_streams[button]
+            button['relief'] = 'raised'
+            message = self.format_stats(title, stats)
+            if self.active_streams:
+                self.result_label.config(text=message)
+            else:
+                self.stop_transmission(message)
+            return
+
+        try:
+            template = PacketTemplate(packet)
+        except ValueError as e:
+            self.result_label.config(text=f"Pacote inválido ({title}): {str(e)}")
+            return
+        try:
+            interval_to_ns(interval)
+        except ValueError as e:
+            self.result_label.config(text=f"Intervalo inválido ({title}): {str(e)}")
+            return
+        # Pacotes sem campos dinâmicos são enviados sempre com os mesmos bytes
+        data = bytes(template.buffer) if template.is_static else template.render
+
         if not self.is_transmitting:
-            # Iniciar a transmissão
+            # Abrir a porta e iniciar a thread de envio compartilhada
             self.is_transmitting = True
-            for b in self.buttons:
-                b['state'] = 'disabled'  # Desativar outros botões durante a transmissão
+            self.scheduler = MultiStreamScheduler()
+            self.scheduler.profiler = self.profiler
             self.stop_button['state'] = 'normal'  # Ativar o botão de parar durante a transmissão
-            threading.Thread(target=self.transmit_data_loop, args=(title, packet, interval)).start()
-        else:
-            # Parar a transmissão
-            self.is_transmitting = False
-            for b in self.buttons:
-                b['state'] = 'normal'  # Reativar outros botões
-            self.stop_button['state'] = 'disabled'  # Desativar o botão de parar
-            self.result_label.config(text="Transmissão interrompida.")
-
-    def stop_transmission(self):
+            threading.Thread(target=self.transmit_data_loop, args=(self.scheduler,)).start()
+        self.scheduler.add_stream(button, data, interval)
+        self.active_streams[button] = title
+        button['relief'] = 'sunken'  # Indica que o fluxo deste botão está ativo
+
+    def stop_transmission(self, message=None):
         """
-        Interrompe a transmissão de dados.
+        Interrompe a transmissão de todos os fluxos e exibe as estatísticas de cada um.
+
+        :param message: Estatísticas de um fluxo já interrompido, exibidas antes
+            das dos demais.
         """
         # Função para parar a transmissão quando o botão de parar é pressionado
         self.is_transmitting = False
-        for button in self.buttons:
-            button['state'] = 'normal'  # Reativar todos os botões de adicionar
-        self.result_label.config(text="Transmissão interrompida.")
+        lines = [message] if message else []
+        if self.scheduler:
+            for button, title in self.active_streams.items():
+                lines.append(self.format_stats(title, self.scheduler.remove_stream(button)))
+            self.scheduler.stop()
+        for button in self.active_streams:
+            button['relief'] = 'raised'
+        self.active_streams.clear()
+        self.stop_button['state'] = 'disabled'  # Desativar o botão de parar
+        if self.profiler:
+            base = time.strftime('perfil_envio_%Y%m%d-%H%M%S')
+            self.profiler.dump(f"{base}.json")
+            self.profiler.dump(f"{base}.folded")
+            lines.append(f"Perfil gravado em {base}.json")
+        self.result_label.config(text='\n'.join(lines) or "Transmissão interrompida.")
+
+    def format_stats(self, title, stats):
+        """
+        Formata as estatísticas de um fluxo interrompido.
+
+        :param title: O título do botão.
+        :param stats: O StreamStats do fluxo.
+        :return: O texto exibido na área de feedback.
+        """
+        summary = stats.summary()
+        return (f"Transmissão interrompida ({title}): {summary['count']} envios, "
+                f"{summary['effective_rate']:.3f}/s de {summary['target_rate']:.3f}/s, "
+                f"jitter máx. {summary['jitter_max_us']:.0f} µs")
 
-    def transmit_data_loop(self, title, packet, interval):
+    def transmit_data_loop(self, scheduler):
         """
         Loop de transmissão de dados.
 
-        Este método é executado em uma thread separada para transmitir os dados
-        com o intervalo especificado até que a transmissão seja interrompida.
+        Este método é executado em uma thread separada e envia os pacotes de
+        todos os fluxos ativos pela mesma porta até que a transmissão seja
+        interrompida. Os envios seguem prazos absolutos e pacotes que vencem no
+        mesmo instante são enviados em uma única escrita.
+
+        :param scheduler: O MultiStreamScheduler com os fluxos ativos.
+        """
+        try:
+            with Serial('COM4', 9600, timeout=1, exclusive=True) as ser:  # Substitua 'COM1' pela porta correta
+                scheduler.run(ser.write)
+        except Exception as e:
+            self.result_label.config(text=f"Erro na transmissão: {str(e)}")
+
+    async def transmit_data_async(self, transport, title, packet, interval, stop_event):
+        """
+        Loop de transmissão de dados no laço de eventos do asyncio.
+
+        Alternativa a transmit_data_loop sem thread própria: vários fluxos podem
+        compartilhar o mesmo laço e a mesma porta (AsyncSerial.AsyncSerialTransport).
+        Como no MultiStreamScheduler, o prazo do envio n é inicio + n * intervalo
+        no relógio monotônico, e os prazos perdidos além de MAX_CATCH_UP
+        intervalos são pulados em vez de enviados em rajada.
 
+        :param transport: O AsyncSerialTransport já aberto.
         :param title: O título do botão.
-        :param packet: O pacote hexadecimal a ser transmitido.
+        :param packet: O pacote hexadecimal a ser transmitido, possivelmente com
+            campos dinâmicos (ver PacketTemplate).
         :param interval: O intervalo de envio em segundos.
+        :param stop_event: O asyncio.Event que interrompe o fluxo, mesmo durante a espera.
+        :return: As estatísticas (StreamStats) do fluxo.
         """
+        stats = StreamStats(interval)
         try:
-            with Serial('COM4', 9600, timeout=1) as ser:  # Substitua 'COM1' pela porta correta
-                while self.is_transmitting:
-                    ser.write(bytes.fromhex(packet))
-                    time.sleep(interval)
+            interval_ns = interval_to_ns(interval)
+            template = PacketTemplate(packet)
+            deadline = time.monotonic_ns()
+            while not stop_event.is_set():
+                delay = (deadline - time.monotonic_ns()) / 1e9
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), delay)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+                actual = time.monotonic_ns()
+                await transport.write_frame(bytes(template.render()))
+                stats.record(deadline, actual)
+                deadline += interval_ns
+                behind = time.monotonic_ns() - deadline
+                if behind > MAX_CATCH_UP * interval_ns:
+                    missed = behind // interval_ns
+                    stats.skipped += missed
+                    deadline += missed * interval_ns
         except Exception as e:
             self.result_label.config(text=f"Erro na transmissão ({title}): {str(e)}")
+        return stats
 
 if __name__ == "__main__":
     root = tk.Tk()
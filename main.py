@@ -3,13 +3,37 @@
 Módulo principal para iniciar a aplicação XBeeDataViewer.
 
 Este módulo importa a classe XBeeDataViewer do arquivo XBeeDataViewer.py e
-inicia a aplicação XBeeDataViewer.
+inicia a aplicação XBeeDataViewer. A porta serial pode ser informada como
+argumento (por exemplo, o pseudo-terminal do XBeeEmulator); o padrão é COM6.
+Com 'auto', a porta e a taxa de baud são descobertas (PortDiscovery).
+
+Uso: python main.py [porta|auto] [--baudrate 9600] [--metrics-port 9464] [--metrics-json arquivo.json] [--profile 100]
 
 @author Francisco Gilson Pereira Almeida Filho
 @date 06 de Fevereiro de 2024
 '''
+import argparse
 from XBeeDataViewer import XBeeDataViewer
 
 if __name__ == "__main__":
-    app = XBeeDataViewer()
-    app.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Visualização dos dados do XBee")
+    parser.add_argument('port', nargs='?', default="COM6", help="porta serial, ou auto para descobri-la")
+    parser.add_argument('--baudrate', type=int, default=9600)
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="publica as métricas (formato do Prometheus) em http://127.0.0.1:<porta>/metrics")
+    parser.add_argument('--metrics-json', default=None, help="grava instantâneos JSON das métricas neste arquivo")
+    parser.add_argument('--profile', type=int, default=None, metavar='N',
+                        help="mede as etapas em 1 de cada N iterações; F12 grava o detalhamento")
+    args = parser.parse_args()
+
+    if args.port == 'auto':
+        from PortDiscovery import discover
+        found = discover()
+        if found is None:
+            parser.error("nenhum XBee encontrado")
+        args.port, args.baudrate = found['port'], found['baudrate']
+        print(f"XBee em {args.port} a {args.baudrate} baud")
+
+    app = XBeeDataViewer(port=args.port, baudrate=args.baudrate, metrics_port=args.metrics_port,
+                         metrics_snapshot=args.metrics_json, profile_every=args.profile)
+    app.mainloop()